@@ -1,12 +1,191 @@
 """Base classes for UCI configuration components."""
 
 import fnmatch
-from typing import Any, Dict, List, Optional, Type, TypeVar
+import re
+import sys
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
 from pydantic import BaseModel, ConfigDict, Field
 
 T = TypeVar("T", bound="UCISection")
 
 
+def _shell_quote(value: Any) -> str:
+    """Escape a value for use inside a single-quoted shell word."""
+    text = str(value)
+    # A single quote ends the word, so it is written as '\'' (close, escaped quote, reopen)
+    if "'" in text:
+        return text.replace("'", "'\\''")
+    return text
+
+
+@lru_cache(maxsize=512)
+def _compile_glob(pattern: str) -> "re.Pattern[str]":
+    """Compile a single glob pattern to a regex, once per distinct pattern."""
+    return re.compile(fnmatch.translate(pattern))
+
+
+@lru_cache(maxsize=256)
+def _compile_globs(patterns: Tuple[str, ...]) -> Tuple[bool, "re.Pattern[str]"]:
+    """
+    Compile a list of glob patterns into one alternation regex.
+
+    The regex is built once per distinct pattern list, so matching a name is a
+    single scan by the regex engine instead of a Python loop over patterns.
+
+    Returns:
+        Whether "*" is among the patterns (everything matches), and the combined
+        regex matching any of the patterns
+    """
+    # Each translated glob is a self-contained group anchored with \Z
+    combined = "|".join(fnmatch.translate(pattern) for pattern in patterns)
+    return "*" in patterns, re.compile(f"(?:{combined})")
+
+
+def _match_path_segments(path: str, pattern: str) -> bool:
+    """
+    Match a path against a glob pattern, supporting ** for multiple segments.
+
+    Args:
+        path: The path to check (e.g., "devices.br_lan.ports")
+        pattern: The pattern to match against (e.g., "devices.*.ports" or "devices.**")
+
+    Returns:
+        True if the path matches the pattern
+    """
+    # Handle exact wildcard match
+    if pattern == "**":
+        return True
+
+    # Split path and pattern into segments
+    path_parts = path.split(".")
+    pattern_parts = pattern.split(".")
+
+    # Track positions in both lists
+    p_idx = 0  # path index
+    pat_idx = 0  # pattern index
+
+    while p_idx < len(path_parts) and pat_idx < len(pattern_parts):
+        pattern_segment = pattern_parts[pat_idx]
+
+        if pattern_segment == "**":
+            # ** can match zero or more segments
+            # Try to match the rest of the pattern with remaining path
+            if pat_idx == len(pattern_parts) - 1:
+                # ** is at the end, matches everything remaining
+                return True
+
+            # Try to match remaining pattern at each position in remaining path
+            for i in range(p_idx, len(path_parts) + 1):
+                remaining_path = ".".join(path_parts[i:])
+                remaining_pattern = ".".join(pattern_parts[pat_idx + 1 :])
+                if _match_path_segments(remaining_path, remaining_pattern):
+                    return True
+            return False
+        elif pattern_segment == "*":
+            # * matches exactly one segment
+            p_idx += 1
+            pat_idx += 1
+        elif _compile_glob(pattern_segment).match(path_parts[p_idx]) is not None:
+            # Regular segment match with glob support
+            p_idx += 1
+            pat_idx += 1
+        else:
+            # No match
+            return False
+
+    # Both must be exhausted for a full match
+    return p_idx == len(path_parts) and pat_idx == len(pattern_parts)
+
+
+def _path_segments_regex(parts: List[str]) -> Optional[str]:
+    """
+    Translate whitelist pattern segments into a regex over the dotted path.
+
+    Mirrors _match_path_segments: "*" matches exactly one segment, "**" matches
+    any number of segments and glob wildcards inside a segment never cross a
+    dot. Returns None for segments using glob features the translation does
+    not cover ("?" and "[...]"), which are then matched segment by segment.
+    """
+    pieces = []
+    for index, segment in enumerate(parts):
+        if segment == "**":
+            if index == len(parts) - 1:
+                # Trailing ** matches whatever remains, even an empty segment
+                pieces.append("(?s:.*)")
+                break
+            rest = _path_segments_regex(parts[index + 1 :])
+            if rest is None:
+                return None
+            # ** consumes whole segments before the rest of the pattern; when
+            # it consumes every remaining segment the rest must match ""
+            skip = f"(?:[^.]*\\.)*{rest}"
+            if re.fullmatch(rest, "") is not None:
+                skip = f"{skip}|(?s:.*)"
+            pieces.append(f"(?:{skip})")
+            break
+        if "[" in segment or "?" in segment:
+            return None
+        pieces.append("[^.]*".join(re.escape(literal) for literal in segment.split("*")))
+        if index < len(parts) - 1:
+            pieces.append("\\.")
+    return "".join(pieces)
+
+
+@lru_cache(maxsize=256)
+def _compile_whitelist(
+    patterns: Tuple[str, ...],
+) -> Tuple[Optional["re.Pattern[str]"], Tuple[str, ...]]:
+    """
+    Compile whitelist path patterns into one alternation regex.
+
+    Returns:
+        The combined regex (None if no pattern could be translated), and the
+        patterns that could not be translated and must be matched one by one
+    """
+    alternatives = []
+    fallback = []
+    for pattern in patterns:
+        regex = ".*" if pattern == "**" else _path_segments_regex(pattern.split("."))
+        if regex is None:
+            fallback.append(pattern)
+            continue
+        alternatives.append(regex)
+        # "interfaces.guest.*" also whitelists the section path "interfaces.guest"
+        if pattern.endswith(".*"):
+            alternatives.append(re.escape(pattern[:-2]))
+    if not alternatives:
+        return None, tuple(fallback)
+    combined = "|".join(f"(?:{regex})" for regex in alternatives)
+    return re.compile(f"(?s:{combined})"), tuple(fallback)
+
+
+@lru_cache(maxsize=4096)
+def _whitelist_match(patterns: Tuple[str, ...], path: str) -> bool:
+    """
+    Return whether a path matches any pattern of a whitelist.
+
+    Results are memoized per (whitelist, path): fleets of devices sharing a
+    policy, and repeated diffs against one device, look up the same logical
+    paths over and over. Keying on the pattern tuple means editing a policy's
+    whitelist can never return a stale answer.
+    """
+    regex, fallback = _compile_whitelist(patterns)
+    if regex is not None and regex.fullmatch(path) is not None:
+        return True
+
+    for pattern in fallback:
+        if _match_path_segments(path, pattern):
+            return True
+
+        # Special case: pattern ending with .* should also match without the .*
+        # This ensures that "interfaces.guest.*" whitelists the section definition too
+        if pattern.endswith(".*") and path == pattern[:-2]:
+            return True
+
+    return False
+
+
 class RemotePolicy(BaseModel):
     """
     Policy for handling remote-only sections and values.
@@ -55,49 +234,7 @@ class RemotePolicy(BaseModel):
         Returns:
             True if the path matches the pattern
         """
-        # Handle exact wildcard match
-        if pattern == "**":
-            return True
-
-        # Split path and pattern into segments
-        path_parts = path.split(".")
-        pattern_parts = pattern.split(".")
-
-        # Track positions in both lists
-        p_idx = 0  # path index
-        pat_idx = 0  # pattern index
-
-        while p_idx < len(path_parts) and pat_idx < len(pattern_parts):
-            pattern_segment = pattern_parts[pat_idx]
-
-            if pattern_segment == "**":
-                # ** can match zero or more segments
-                # Try to match the rest of the pattern with remaining path
-                if pat_idx == len(pattern_parts) - 1:
-                    # ** is at the end, matches everything remaining
-                    return True
-
-                # Try to match remaining pattern at each position in remaining path
-                for i in range(p_idx, len(path_parts) + 1):
-                    remaining_path = ".".join(path_parts[i:])
-                    remaining_pattern = ".".join(pattern_parts[pat_idx + 1 :])
-                    if self._match_path_pattern(remaining_path, remaining_pattern):
-                        return True
-                return False
-            elif pattern_segment == "*":
-                # * matches exactly one segment
-                p_idx += 1
-                pat_idx += 1
-            elif fnmatch.fnmatch(path_parts[p_idx], pattern_segment):
-                # Regular segment match with glob support
-                p_idx += 1
-                pat_idx += 1
-            else:
-                # No match
-                return False
-
-        # Both must be exhausted for a full match
-        return p_idx == len(path_parts) and pat_idx == len(pattern_parts)
+        return _match_path_segments(path, pattern)
 
     def is_path_whitelisted(self, path: str) -> bool:
         """
@@ -116,17 +253,38 @@ class RemotePolicy(BaseModel):
         if not self.whitelist:
             return False
 
+        # "**" keeps everything; answer before the memo so it is not filled
+        # with one entry per path
+        if "**" in self.whitelist:
+            return True
+
+        return _whitelist_match(tuple(self.whitelist), path)
+
+    def section_fully_whitelisted(self, section_path: str) -> bool:
+        """
+        Check if a section and every option directly under it are whitelisted.
+
+        True when the section path itself is whitelisted and some pattern ends
+        in "*" or "**" after a prefix matching the section, such as
+        "interfaces.guest.*" or "interfaces.*.*" for "interfaces.guest". Callers
+        can then keep all of the section's options without matching each one.
+
+        Args:
+            section_path: The relative section path (e.g., "interfaces.guest")
+
+        Returns:
+            True if every path in the section is whitelisted
+        """
+        if not self.is_path_whitelisted(section_path):
+            return False
+        if "**" in self.whitelist:
+            return True
+
         for pattern in self.whitelist:
-            if self._match_path_pattern(path, pattern):
+            prefix, _, last = pattern.rpartition(".")
+            if last in ("*", "**") and prefix and _match_path_segments(section_path, prefix):
                 return True
 
-            # Special case: pattern ending with .* should also match without the .*
-            # This ensures that "interfaces.guest.*" whitelists the section definition too
-            if pattern.endswith(".*"):
-                prefix = pattern[:-2]  # Remove the ".*"
-                if path == prefix:
-                    return True
-
         return False
 
     def is_section_allowed(self, section_name: str) -> bool:
@@ -145,12 +303,8 @@ class RemotePolicy(BaseModel):
         if not self.allowed_sections:
             return False
 
-        for pattern in self.allowed_sections:
-            if pattern == "*":
-                return True
-            if fnmatch.fnmatch(section_name, pattern):
-                return True
-        return False
+        allow_all, regex = _compile_globs(tuple(self.allowed_sections))
+        return allow_all or regex.match(section_name) is not None
 
     def is_value_allowed(self, value: str) -> bool:
         """
@@ -169,12 +323,8 @@ class RemotePolicy(BaseModel):
             # No value filtering - all values allowed
             return True
 
-        for pattern in self.allowed_values:
-            if pattern == "*":
-                return True
-            if fnmatch.fnmatch(str(value), pattern):
-                return True
-        return False
+        allow_all, regex = _compile_globs(tuple(self.allowed_values))
+        return allow_all or regex.match(str(value)) is not None
 
     def should_keep_remote_section(self, section_name: str) -> bool:
         """
@@ -227,51 +377,88 @@ class RemotePolicy(BaseModel):
             return self.is_path_whitelisted(path)
 
         # Fall back to legacy behavior for backward compatibility
-        parts = path.split(".")
-        if len(parts) >= 1:
-            # For section-level paths (e.g., "devices.br_lan")
-            # Check if the section type and name pattern match
-            section_name = parts[1] if len(parts) >= 2 else parts[0]
-            return self.is_section_allowed(section_name)
-
-        return False
+        # For section-level paths (e.g., "devices.br_lan")
+        # Check if the section type and name pattern match; only the second
+        # segment is needed, so the path is not split into a list
+        head, sep, rest = path.partition(".")
+        section_name = rest.partition(".")[0] if sep else head
+        return self.is_section_allowed(section_name)
 
 
 class UCICommand:
-    """Represents a single UCI command."""
+    """Represents a single UCI command.
+
+    Commands are treated as immutable once created, so derived values such as
+    the rendered command string are computed at most once.
+    """
+
+    __slots__ = (
+        "action",
+        "path",
+        "value",
+        "package",
+        "section",
+        "option",
+        "path_depth",
+        "_string",
+    )
 
     def __init__(self, action: str, path: str, value: Optional[str] = None):
-        self.action = action
-        self.path = path
+        # Paths and actions repeat across thousands of commands; interning them
+        # shares one string object and lets dict/set lookups compare by identity
+        self.action = sys.intern(action)
+        self.path = sys.intern(path)
         self.value = value
+        # Path components (package.section.option), split once here so callers
+        # grouping or filtering commands never re-split the path. Package and
+        # section names repeat across most commands and are interned as well.
+        parts = path.split(".", 2)
+        self.package = sys.intern(parts[0])
+        self.section: Optional[str] = sys.intern(parts[1]) if len(parts) > 1 else None
+        self.option: Optional[str] = parts[2] if len(parts) > 2 else None
+        # Number of path segments: 2 for a section, 3 for an option
+        self.path_depth = path.count(".") + 1
+        self._string: Optional[str] = None
+
+    def key(self) -> Tuple[str, Optional[str]]:
+        """Return the identity used when diffing commands.
+
+        Two commands with the same key describe the same UCI setting, so the
+        key can be used for hash-based membership tests instead of scanning
+        command lists.
+        """
+        return (self.path, self.value)
 
     def to_string(self) -> str:
         """Convert command to UCI string format."""
-        if self.action == "set":
-            return f"uci set {self.path}='{self.value}'"
-        elif self.action == "add_list":
-            return f"uci add_list {self.path}='{self.value}'"
-        elif self.action == "del_list":
-            return f"uci del_list {self.path}='{self.value}'"
-        elif self.action == "delete":
-            return f"uci delete {self.path}"
-        else:
-            raise ValueError(f"Unknown action: {self.action}")
+        if self._string is None:
+            if self.action == "set":
+                self._string = f"uci set {self.path}='{_shell_quote(self.value)}'"
+            elif self.action == "add_list":
+                self._string = f"uci add_list {self.path}='{_shell_quote(self.value)}'"
+            elif self.action == "del_list":
+                self._string = f"uci del_list {self.path}='{_shell_quote(self.value)}'"
+            elif self.action == "delete":
+                self._string = f"uci delete {self.path}"
+            else:
+                raise ValueError(f"Unknown action: {self.action}")
+        return self._string
 
     def to_string_with_value(self, display_value: str) -> str:
         """Convert command to UCI string format with a custom display value.
 
-        This is useful for masking sensitive values in output.
+        This is useful for masking sensitive values in output. The display
+        value is quoted the same way as in to_string().
 
         Args:
             display_value: The value to display instead of the actual value
         """
         if self.action == "set":
-            return f"uci set {self.path}='{display_value}'"
+            return f"uci set {self.path}='{_shell_quote(display_value)}'"
         elif self.action == "add_list":
-            return f"uci add_list {self.path}='{display_value}'"
+            return f"uci add_list {self.path}='{_shell_quote(display_value)}'"
         elif self.action == "del_list":
-            return f"uci del_list {self.path}='{display_value}'"
+            return f"uci del_list {self.path}='{_shell_quote(display_value)}'"
         elif self.action == "delete":
             return f"uci delete {self.path}"
         else:
@@ -285,6 +472,10 @@ class UCICommand:
             return False
         return self.action == other.action and self.path == other.path and self.value == other.value
 
+    def __hash__(self) -> int:
+        # Consistent with __eq__, so commands can be used directly in sets and as dict keys
+        return hash((self.action, self.path, self.value))
+
 
 class UCISection(BaseModel):
     """Base class for UCI configuration sections using Pydantic."""
@@ -314,36 +505,49 @@ class UCISection(BaseModel):
         """Generate UCI commands for this section."""
         commands = []
 
+        # Private attributes go through pydantic's __getattr__, which is far
+        # slower than a local, so the section path is read once per call
+        section_path = f"{self._package}.{self._section}"
+
         # Set section type
-        commands.append(UCICommand("set", f"{self._package}.{self._section}", self._section_type))
+        commands.append(UCICommand("set", section_path, self._section_type))
 
         # Get all fields except private ones (starting with _)
         for field_name, field_value in self.model_dump(exclude_none=True).items():
             if field_name.startswith("_"):
                 continue
 
+            option_path = f"{section_path}.{field_name}"
             if isinstance(field_value, list):
                 # Handle list options
                 for item in field_value:
                     commands.append(
-                        UCICommand(
-                            "add_list",
-                            f"{self._package}.{self._section}.{field_name}",
-                            self._get_option_value(item),
-                        )
+                        UCICommand("add_list", option_path, self._get_option_value(item))
                     )
             else:
                 # Handle single-value options
                 commands.append(
-                    UCICommand(
-                        "set",
-                        f"{self._package}.{self._section}.{field_name}",
-                        self._get_option_value(field_value),
-                    )
+                    UCICommand("set", option_path, self._get_option_value(field_value))
                 )
 
         return commands
 
+    def get_commands_by_path(self) -> Dict[str, List[UCICommand]]:
+        """
+        Get this section's UCI commands grouped by path.
+
+        Looking an option up is then a dict access rather than a scan of
+        get_commands(). Single-value options map to one command; list options
+        map to one command per item, in order.
+
+        Returns:
+            Dict[path, List[commands]]
+        """
+        by_path: Dict[str, List[UCICommand]] = {}
+        for cmd in self.get_commands():
+            by_path.setdefault(cmd.path, []).append(cmd)
+        return by_path
+
     # Schema generation methods
     @classmethod
     def json_schema(cls, title: Optional[str] = None) -> Dict[str, Any]:
@@ -8,7 +8,7 @@ from typing import Optional, Union, Any
 import click
 from dotenv import load_dotenv
 
-from .config import UCIConfig, ConfigDiff, get_display_value
+from .config import UCIConfig, ConfigDiff, fetch_uci_configs, get_display_value
 from .ssh import SSHConnection
 from .serial_connection import SerialConnection
 from .network import NetworkDevice, NetworkInterface
@@ -176,10 +176,13 @@ def _import_remote_config(conn: Connection) -> UCIConfig:
     """Import configuration from a remote device into a UCIConfig object."""
     config = UCIConfig()
     packages = ["network", "wireless", "dhcp", "firewall", "sqm"]
+    config_strs = fetch_uci_configs(conn, packages)
 
     for package in packages:
         try:
-            config_str = conn.get_uci_config(package)
+            config_str = config_strs[package]
+            if isinstance(config_str, Exception):
+                raise config_str
             sections = _parse_uci_export_to_dict(package, config_str)
 
             if package == "network":
@@ -727,11 +730,14 @@ def import_config(
             try:
                 config = UCIConfig()
                 package_list = [p.strip() for p in packages.split(",")]
+                config_strs = fetch_uci_configs(conn, package_list, spinner=spinner)
 
                 for package in package_list:
                     spinner.update(f"Importing {package}...")
                     try:
-                        config_str = conn.get_uci_config(package)
+                        config_str = config_strs[package]
+                        if isinstance(config_str, Exception):
+                            raise config_str
                         sections = _parse_uci_export_to_dict(package, config_str)
 
                         if package == "network":
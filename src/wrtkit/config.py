@@ -1,19 +1,42 @@
 """Main UCI configuration class."""
 
-import fnmatch
+import hashlib
 import json
+import re
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 import yaml
 from omegaconf import OmegaConf
-from typing import List, Dict, Any, Optional, Union, cast
-from .base import UCICommand, RemotePolicy
+from typing import Callable, DefaultDict, List, Dict, Any, Optional, Tuple, Union, cast
+from .base import UCICommand, RemotePolicy, _compile_glob
 from .network import NetworkConfig, NetworkInterface, NetworkDevice, BridgeVLAN
 from .wireless import WirelessConfig, WirelessRadio, WirelessInterface
 from .dhcp import DHCPConfig, DHCPSection, DHCPHost
 from .firewall import FirewallConfig, FirewallZone, FirewallForwarding
 from .sqm import SQMConfig, SQMQueue
 from .ssh import SSHConnection
+from .serial_connection import SerialConnection
 from .progress import Spinner, ProgressBar
 
+Connection = Union[SSHConnection, SerialConnection]
+
+# Upper bound on concurrent SSH channels opened by fetch_uci_configs(). Servers
+# cap sessions per connection (OpenSSH MaxSessions defaults to 10), so a long
+# package list must not open one channel per package at once.
+_MAX_FETCH_WORKERS = 4
+
+
+# Records of the 'config'/'option'/'list' UCI format, one per line:
+#   config <type> '<name>'  -> groups 1-2
+#   \toption <name> '<value>' or \tlist <name> '<value>'  -> groups 3-5
+# Anonymous sections and the 'package' header do not match and are skipped.
+_UCI_SHOW_RE = re.compile(
+    r"^(?:config[ \t]+(\S+)[ \t]+'([^'\n]*)"
+    r"|\t(option|list)[ \t]+(\S+)[ \t]+'([^'\n]*))",
+    re.MULTILINE,
+)
+
 
 # ANSI color codes for terminal output
 class Colors:
@@ -90,6 +113,18 @@ def get_display_value(path: str, value: Any) -> str:
 class ConfigDiff:
     """Represents the difference between two configurations."""
 
+    __slots__ = (
+        "to_add",
+        "to_remove",
+        "to_modify",
+        "remote_only",
+        "whitelisted",
+        "common",
+        "_local_sections",
+        "_remote_sections",
+        "_render_cache",
+    )
+
     def __init__(self) -> None:
         self.to_add: List[UCICommand] = []
         self.to_remove: List[UCICommand] = []
@@ -106,6 +141,8 @@ class ConfigDiff:
             set()
         )  # (package, section) pairs in local config
         self._remote_sections: set[tuple[str, str]] = set()  # (package, section) pairs on remote
+        # Rendered output keyed by (format, color), stored with the state it was rendered from
+        self._render_cache: Dict[Tuple[str, bool], Tuple[tuple, str]] = {}
 
     def is_empty(self) -> bool:
         """Check if there are no differences."""
@@ -164,7 +201,7 @@ class ConfigDiff:
                 # * matches exactly one segment
                 p_idx += 1
                 pat_idx += 1
-            elif fnmatch.fnmatch(path_parts[p_idx], pattern_segment):
+            elif _compile_glob(pattern_segment).match(path_parts[p_idx]) is not None:
                 # Regular segment match with glob support
                 p_idx += 1
                 pat_idx += 1
@@ -266,24 +303,9 @@ class ConfigDiff:
         Returns:
             Set of package names (e.g., {"network", "wireless"}) that have changes.
         """
-        packages: set[str] = set()
-
-        for cmd in self.to_add:
-            parts = cmd.path.split(".")
-            if parts:
-                packages.add(parts[0])
-
-        for cmd in self.to_remove:
-            parts = cmd.path.split(".")
-            if parts:
-                packages.add(parts[0])
-
-        for old_cmd, new_cmd in self.to_modify:
-            parts = new_cmd.path.split(".")
-            if parts:
-                packages.add(parts[0])
-
-        return packages
+        # One pass over every changed command; only the leading path segment is needed
+        changed = chain(self.to_add, self.to_remove, (new_cmd for _, new_cmd in self.to_modify))
+        return {cmd.package for cmd in changed}
 
     def get_removal_commands(self, packages: Optional[List[str]] = None) -> List[UCICommand]:
         """
@@ -302,40 +324,37 @@ class ConfigDiff:
             List of UCICommand with action='delete' for items to remove
         """
         removal_cmds = []
-        deleted_sections: set[str] = set()  # Track sections we're already deleting
+        # Sections we're already deleting, as (package, section) pairs
+        deleted_sections: set[tuple[str, Optional[str]]] = set()
+        package_filter = None if packages is None else set(packages)
 
         # First pass: identify sections that are entirely remote-only
         # These are sections where the section itself is in to_remove
+        remote_only_sections = self._remote_sections - self._local_sections
         for cmd in self.to_remove:
-            parts = cmd.path.split(".")
-            if len(parts) == 2:
+            if cmd.path_depth == 2:
                 # This is a section definition (e.g., "wireless.mesh0_iface")
-                pkg, section = parts[0], parts[1]
-                if packages is None or pkg in packages:
-                    if self.is_section_remote_only(pkg, section):
-                        deleted_sections.add(cmd.path)
+                if package_filter is None or cmd.package in package_filter:
+                    if (cmd.package, cmd.section) in remote_only_sections:
+                        deleted_sections.add((cmd.package, cmd.section))
 
         # Second pass: generate removal commands
         for cmd in self.to_remove:
             # Filter by package if specified
-            parts = cmd.path.split(".")
-            if len(parts) < 2:
+            if cmd.section is None:
                 continue
 
-            cmd_package = parts[0]
-            if packages is not None and cmd_package not in packages:
+            if package_filter is not None and cmd.package not in package_filter:
                 continue
 
             # Check if this is a section definition or an option within a section
-            if len(parts) == 2:
+            if cmd.option is None:
                 # Section definition - delete the whole section
                 removal_cmds.append(UCICommand("delete", cmd.path, None))
             else:
                 # Option within a section (e.g., "wireless.mesh0_iface.device")
-                section_path = f"{parts[0]}.{parts[1]}"
-
                 # Skip if we're already deleting the entire section
-                if section_path in deleted_sections:
+                if (cmd.package, cmd.section) in deleted_sections:
                     continue
 
                 if cmd.action == "add_list":
@@ -374,25 +393,59 @@ class ConfigDiff:
         Returns:
             Dict[package, Dict[section, List[commands]]]
         """
-        grouped: Dict[str, Dict[str, List[UCICommand]]] = {}
+        # defaultdict avoids allocating a throwaway {} / [] per command the way
+        # chained setdefault does; callers get plain dicts back so lookups of
+        # missing keys never insert
+        grouped: DefaultDict[str, DefaultDict[str, List[UCICommand]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
 
         for cmd in commands:
-            # Parse the path: package.section.option
-            parts = cmd.path.split(".")
-            if len(parts) < 2:
+            if cmd.section is None:
                 continue
+            grouped[cmd.package][cmd.section].append(cmd)
 
-            package = parts[0]
-            section = parts[1]
+        return {package: dict(sections) for package, sections in grouped.items()}
 
-            if package not in grouped:
-                grouped[package] = {}
-            if section not in grouped[package]:
-                grouped[package][section] = []
+    @staticmethod
+    def _option_label(cmd: UCICommand) -> str:
+        """Return the part of a command path below its section, for tree display."""
+        if cmd.option is not None:
+            return cmd.option
+        return cmd.path
+
+    def _render_state(self) -> tuple:
+        """Snapshot everything the formatters read, to validate cached output."""
+        return (
+            tuple(self.to_add),
+            tuple(self.to_remove),
+            tuple(self.to_modify),
+            tuple(self.remote_only),
+            len(self.whitelisted),
+            len(self.common),
+            frozenset(self._local_sections),
+            frozenset(self._remote_sections),
+        )
+
+    def _render(self, fmt: str, color: bool, formatter: Callable[[bool], str]) -> str:
+        """
+        Return formatted output, reusing the previous rendering if the diff is unchanged.
 
-            grouped[package][section].append(cmd)
+        The diff lists are public and may be reassigned or mutated, so a cached
+        rendering is only reused when the current state snapshot matches the
+        one it was produced from.
+        """
+        # Checked before snapshotting so an empty diff costs nothing to render
+        if self.is_empty():
+            return "No differences found."
 
-        return grouped
+        state = self._render_state()
+        cached = self._render_cache.get((fmt, color))
+        if cached is not None and cached[0] == state:
+            return cached[1]
+        output = formatter(color)
+        self._render_cache[(fmt, color)] = (state, output)
+        return output
 
     def __str__(self) -> str:
         """Format the diff for display."""
@@ -408,9 +461,10 @@ class ConfigDiff:
         Returns:
             Formatted diff string
         """
-        if self.is_empty():
-            return "No differences found."
+        return self._render("string", color, self._format_string)
 
+    def _format_string(self, color: bool) -> str:
+        """Build the flat listing returned by to_string(); the diff is not empty."""
         lines = []
 
         # Color prefixes
@@ -486,9 +540,10 @@ class ConfigDiff:
         Returns:
             A tree-structured string representation of the diff
         """
-        if self.is_empty():
-            return "No differences found."
+        return self._render("tree", color, self._format_tree)
 
+    def _format_tree(self, color: bool) -> str:
+        """Build the package/section tree returned by to_tree(); the diff is not empty."""
         lines = []
 
         # Color codes
@@ -520,20 +575,13 @@ class ConfigDiff:
         # Don't group whitelisted items - they won't be displayed in the tree
 
         # Group modifications
-        modify_grouped: Dict[str, Dict[str, List[tuple[UCICommand, UCICommand]]]] = {}
+        modify_grouped: DefaultDict[
+            str, DefaultDict[str, List[tuple[UCICommand, UCICommand]]]
+        ] = defaultdict(lambda: defaultdict(list))
         for old_cmd, new_cmd in self.to_modify:
-            parts = new_cmd.path.split(".")
-            if len(parts) < 2:
+            if new_cmd.section is None:
                 continue
-            package = parts[0]
-            section = parts[1]
-
-            if package not in modify_grouped:
-                modify_grouped[package] = {}
-            if section not in modify_grouped[package]:
-                modify_grouped[package][section] = []
-
-            modify_grouped[package][section].append((old_cmd, new_cmd))
+            modify_grouped[new_cmd.package][new_cmd.section].append((old_cmd, new_cmd))
 
         # Get all packages involved
         all_packages: set[str] = set()
@@ -543,20 +591,22 @@ class ConfigDiff:
         all_packages.update(remote_only_grouped.keys())
         # Note: whitelisted items are not displayed, only counted
 
+        # Section-level labels, computed once for the whole tree
+        config_only_sections = self._local_sections - self._remote_sections
+        remote_only_sections = self._remote_sections - self._local_sections
+
         # Format tree for each package
         for package in sorted(all_packages):
             lines.append(f"\n{pkg_color}{package}/{reset}")
 
+            # Resolve this package's groups once rather than per section
+            pkg_add = add_grouped.get(package, {})
+            pkg_remove = remove_grouped.get(package, {})
+            pkg_modify = modify_grouped.get(package, {})
+            pkg_remote_only = remote_only_grouped.get(package, {})
+
             # Get all sections in this package
-            sections: set[str] = set()
-            if package in add_grouped:
-                sections.update(add_grouped[package].keys())
-            if package in remove_grouped:
-                sections.update(remove_grouped[package].keys())
-            if package in modify_grouped:
-                sections.update(modify_grouped[package].keys())
-            if package in remote_only_grouped:
-                sections.update(remote_only_grouped[package].keys())
+            sections = set(pkg_add).union(pkg_remove, pkg_modify, pkg_remote_only)
 
             sections_list = sorted(sections)
             for i, section in enumerate(sections_list):
@@ -566,61 +616,41 @@ class ConfigDiff:
 
                 # Determine section-level label
                 section_label = ""
-                if self.is_section_config_only(package, section):
+                if (package, section) in config_only_sections:
                     section_label = f" {config_only_label}"
-                elif self.is_section_remote_only(package, section):
+                elif (package, section) in remote_only_sections:
                     section_label = f" {remote_only_section_label}"
 
                 lines.append(f"{section_prefix}{section}{section_label}")
 
                 # Add commands to add
-                if package in add_grouped and section in add_grouped[package]:
-                    for cmd in add_grouped[package][section]:
-                        option = (
-                            ".".join(cmd.path.split(".")[2:])
-                            if len(cmd.path.split(".")) > 2
-                            else cmd.path
-                        )
-                        display_val = get_display_value(cmd.path, cmd.value)
-                        lines.append(f"{item_prefix}  {add_sym} {option} = {display_val}")
+                for cmd in pkg_add.get(section, ()):
+                    option = self._option_label(cmd)
+                    display_val = get_display_value(cmd.path, cmd.value)
+                    lines.append(f"{item_prefix}  {add_sym} {option} = {display_val}")
 
                 # Add commands to remove
-                if package in remove_grouped and section in remove_grouped[package]:
-                    for cmd in remove_grouped[package][section]:
-                        option = (
-                            ".".join(cmd.path.split(".")[2:])
-                            if len(cmd.path.split(".")) > 2
-                            else cmd.path
-                        )
-                        display_val = get_display_value(cmd.path, cmd.value)
-                        lines.append(f"{item_prefix}  {remove_sym} {option} = {display_val}")
+                for cmd in pkg_remove.get(section, ()):
+                    option = self._option_label(cmd)
+                    display_val = get_display_value(cmd.path, cmd.value)
+                    lines.append(f"{item_prefix}  {remove_sym} {option} = {display_val}")
 
                 # Add commands to modify
-                if package in modify_grouped and section in modify_grouped[package]:
-                    for old_cmd, new_cmd in modify_grouped[package][section]:
-                        option = (
-                            ".".join(new_cmd.path.split(".")[2:])
-                            if len(new_cmd.path.split(".")) > 2
-                            else new_cmd.path
-                        )
-                        old_display_val = get_display_value(old_cmd.path, old_cmd.value)
-                        new_display_val = get_display_value(new_cmd.path, new_cmd.value)
-                        lines.append(f"{item_prefix}  {modify_sym} {option}")
-                        lines.append(f"{item_prefix}    {remove_sym} {old_display_val}")
-                        lines.append(f"{item_prefix}    {add_sym} {new_display_val}")
+                for old_cmd, new_cmd in pkg_modify.get(section, ()):
+                    option = self._option_label(new_cmd)
+                    old_display_val = get_display_value(old_cmd.path, old_cmd.value)
+                    new_display_val = get_display_value(new_cmd.path, new_cmd.value)
+                    lines.append(f"{item_prefix}  {modify_sym} {option}")
+                    lines.append(f"{item_prefix}    {remove_sym} {old_display_val}")
+                    lines.append(f"{item_prefix}    {add_sym} {new_display_val}")
 
                 # Add remote-only commands
-                if package in remote_only_grouped and section in remote_only_grouped[package]:
-                    for cmd in remote_only_grouped[package][section]:
-                        option = (
-                            ".".join(cmd.path.split(".")[2:])
-                            if len(cmd.path.split(".")) > 2
-                            else cmd.path
-                        )
-                        display_val = get_display_value(cmd.path, cmd.value)
-                        lines.append(
-                            f"{item_prefix}  {remote_sym} {option} = {display_val} {remote_label}"
-                        )
+                for cmd in pkg_remote_only.get(section, ()):
+                    option = self._option_label(cmd)
+                    display_val = get_display_value(cmd.path, cmd.value)
+                    lines.append(
+                        f"{item_prefix}  {remote_sym} {option} = {display_val} {remote_label}"
+                    )
 
         # Summary footer
         summary_parts = []
@@ -644,6 +674,74 @@ class ConfigDiff:
         return "\n".join(lines)
 
 
+def fetch_uci_configs(
+    conn: Connection,
+    packages: List[str],
+    spinner: Optional[Spinner] = None,
+) -> Dict[str, Union[str, Exception]]:
+    """
+    Fetch the raw UCI configuration of several packages.
+
+    Connections that provide get_uci_configs() (such as the serial console)
+    export all packages with a single command, falling back to one command per
+    package if that output is incomplete. Over SSH the packages are
+    fetched concurrently: each request opens its own channel on the shared
+    transport, so the total wait is roughly one round-trip instead of one
+    per package.
+
+    Args:
+        conn: Connection to the remote device
+        packages: Package names to fetch
+        spinner: Optional spinner to update with progress
+
+    Returns:
+        Mapping of package name to its configuration text, or to the
+        exception raised while fetching it. If the device cannot be
+        reached, every package maps to the connection error.
+    """
+
+    def fetch(package: str) -> Union[str, Exception]:
+        if spinner:
+            spinner.update(f"Fetching {package} config...")
+        try:
+            return conn.get_uci_config(package)
+        except Exception as e:
+            return e
+
+    fetch_many = getattr(conn, "get_uci_configs", None)
+    if fetch_many is not None and len(packages) > 1:
+        if spinner:
+            spinner.update("Fetching UCI config...")
+        try:
+            fetched = fetch_many(packages)
+        except ConnectionError as e:
+            return {package: e for package in packages}
+        except Exception:
+            # The combined output could not be used (e.g. it was cut off by a
+            # timeout), so fall back to fetching each package on its own below
+            pass
+        else:
+            return {
+                package: (
+                    fetched[package]
+                    if package in fetched
+                    else RuntimeError(f"Failed to get UCI config for {package}")
+                )
+                for package in packages
+            }
+
+    if isinstance(conn, SSHConnection) and len(packages) > 1:
+        # Connect up front so worker threads share a single client
+        try:
+            conn.connect()
+        except Exception as e:
+            return {package: e for package in packages}
+        with ThreadPoolExecutor(max_workers=min(len(packages), _MAX_FETCH_WORKERS)) as executor:
+            return dict(zip(packages, executor.map(fetch, packages)))
+
+    return {package: fetch(package) for package in packages}
+
+
 class UCIConfig:
     """Main UCI configuration class."""
 
@@ -653,6 +751,14 @@ class UCIConfig:
         self.dhcp = DHCPConfig()
         self.firewall = FirewallConfig()
         self.sqm = SQMConfig()
+        # Parsed remote packages keyed by (package, digest of the raw text), least
+        # recently used first. Repeated diffs against an unchanged device skip
+        # re-parsing; the size bounds memory in long-running processes that poll
+        # many devices (0 disables it).
+        self.parse_cache_size = 128
+        self._parse_cache: "OrderedDict[Tuple[str, bytes], Tuple[UCICommand, ...]]" = (
+            OrderedDict()
+        )
 
     # Convenience methods to maintain backward compatibility
     def add_network_interface(self, interface: "NetworkInterface") -> "UCIConfig":
@@ -727,6 +833,31 @@ class UCIConfig:
         commands.extend(self.sqm.get_commands())
         return commands
 
+    def get_commands_by_package(self, package: str) -> List[UCICommand]:
+        """
+        Get the UCI commands of a single package.
+
+        Only that package's sections are rendered, rather than building every
+        command and filtering the result by path.
+
+        Args:
+            package: The package name (e.g., "network", "wireless", "dhcp", "firewall", "sqm")
+
+        Returns:
+            The package's commands, or an empty list for an unknown package
+        """
+        if package == "network":
+            return self.network.get_commands()
+        elif package == "wireless":
+            return self.wireless.get_commands()
+        elif package == "dhcp":
+            return self.dhcp.get_commands()
+        elif package == "firewall":
+            return self.firewall.get_commands()
+        elif package == "sqm":
+            return self.sqm.get_commands()
+        return []
+
     def to_script(self, include_commit: bool = True, include_reload: bool = True) -> str:
         """
         Generate a shell script with all UCI commands.
@@ -739,10 +870,7 @@ class UCIConfig:
             A shell script as a string
         """
         lines = ["#!/bin/sh", ""]
-
-        commands = self.get_all_commands()
-        for cmd in commands:
-            lines.append(cmd.to_string())
+        lines.extend(cmd.to_string() for cmd in self.get_all_commands())
 
         if include_commit:
             lines.append("")
@@ -758,23 +886,21 @@ class UCIConfig:
     def _parse_uci_export_format(self, package: str, config_str: str) -> List[UCICommand]:
         """Parse UCI export format: package.section.option='value'"""
         commands = []
-        for line in config_str.strip().split("\n"):
-            if not line or line.startswith("#"):
+        # splitlines() skips the copy strip() would make of the whole text and
+        # also copes with CRLF output
+        for line in config_str.splitlines():
+            if not line or line[0] == "#":
                 continue
             # UCI export format: package.section=type or package.section.option=value
-            if "=" in line:
-                parts = line.split("=", 1)
-                path = parts[0].strip()
-                value = parts[1].strip().strip("'\"")
-
-                # Determine if this is a section or option
-                path_parts = path.split(".")
-                if len(path_parts) == 2:
-                    # Section definition
-                    commands.append(UCICommand("set", path, value))
-                elif len(path_parts) == 3:
-                    # Option
-                    commands.append(UCICommand("set", path, value))
+            path, sep, value = line.partition("=")
+            if not sep:
+                continue
+            path = path.strip()
+
+            # Keep section definitions (one dot) and options (two dots);
+            # counting avoids allocating a list per line just to size it
+            if path.count(".") in (1, 2):
+                commands.append(UCICommand("set", path, value.strip().strip("'\"")))
         return commands
 
     def _parse_uci_show_format(self, package: str, config_str: str) -> List[UCICommand]:
@@ -788,46 +914,58 @@ class UCIConfig:
         commands = []
         current_section = None
 
-        for line in config_str.strip().split("\n"):
-            line = line.rstrip()
-            if not line or line.startswith("package "):
-                continue
+        for match in _UCI_SHOW_RE.finditer(config_str):
+            section_type, section_name, kind, name, value = match.groups()
 
             # Section definition: config <type> '<name>'
-            if line.startswith("config "):
-                parts = line.split("'")
-                if len(parts) >= 2:
-                    section_name = parts[1]
-                    section_type = line.split()[1].strip("'")
-                    current_section = section_name
-                    # Add section definition
-                    commands.append(UCICommand("set", f"{package}.{section_name}", section_type))
-
-            # Option: \toption <name> '<value>'
-            elif line.startswith("\toption ") and current_section:
-                parts = line.strip().split("'")
-                if len(parts) >= 2:
-                    option_name = line.split()[1].strip("'")
-                    option_value = parts[1]
-                    commands.append(
-                        UCICommand(
-                            "set", f"{package}.{current_section}.{option_name}", option_value
-                        )
-                    )
+            if section_type is not None:
+                current_section = section_name
+                commands.append(
+                    UCICommand("set", f"{package}.{section_name}", section_type.strip("'"))
+                )
+            elif current_section:
+                # Option: \toption <name> '<value>'
+                # List: \tlist <name> '<value>' (uses add_list command)
+                action = "set" if kind == "option" else "add_list"
+                option_name = name.strip("'")
+                commands.append(
+                    UCICommand(action, f"{package}.{current_section}.{option_name}", value)
+                )
 
-            # List: \tlist <name> '<value>'
-            elif line.startswith("\tlist ") and current_section:
-                parts = line.strip().split("'")
-                if len(parts) >= 2:
-                    list_name = line.split()[1].strip("'")
-                    list_value = parts[1]
-                    # For lists, we use add_list command
-                    commands.append(
-                        UCICommand(
-                            "add_list", f"{package}.{current_section}.{list_name}", list_value
-                        )
-                    )
+        return commands
 
+    def _parse_package_config(self, package: str, config_str: str) -> List[UCICommand]:
+        """
+        Parse the raw configuration of one package, reusing cached results.
+
+        Args:
+            package: The package name
+            config_str: Output of 'uci export' or 'uci show' for the package
+
+        Returns:
+            List of UCICommand parsed from the text
+        """
+        # Key on a digest so the cache does not keep every multi-KB payload alive
+        key = (package, hashlib.blake2b(config_str.encode(), digest_size=16).digest())
+        cached = self._parse_cache.get(key)
+        if cached is not None:
+            self._parse_cache.move_to_end(key)
+            return list(cached)
+
+        # Detect format from the leading token: the 'config'/'option' syntax
+        # always opens with a 'package' or 'config' line, while the = syntax
+        # opens with a '<package>.<section>' path
+        if config_str.lstrip().startswith(("package ", "config ")):
+            # UCI show format
+            commands = self._parse_uci_show_format(package, config_str)
+        else:
+            # UCI export format
+            commands = self._parse_uci_export_format(package, config_str)
+
+        if self.parse_cache_size > 0:
+            self._parse_cache[key] = tuple(commands)
+            while len(self._parse_cache) > self.parse_cache_size:
+                self._parse_cache.popitem(last=False)
         return commands
 
     def _parse_remote_config(
@@ -847,19 +985,15 @@ class UCIConfig:
         # Optional packages that don't require warnings if missing
         optional_packages = ["sqm"]
 
+        config_strs = fetch_uci_configs(ssh, packages, spinner=spinner)
+
         for package in packages:
-            if spinner:
-                spinner.update(f"Fetching {package} config...")
             try:
-                config_str = ssh.get_uci_config(package)
+                config_str = config_strs[package]
+                if isinstance(config_str, Exception):
+                    raise config_str
 
-                # Detect format: 'uci export' uses = syntax, 'uci show' uses 'config'/'option' syntax
-                if "config " in config_str or "\toption " in config_str:
-                    # UCI show format
-                    commands.extend(self._parse_uci_show_format(package, config_str))
-                else:
-                    # UCI export format
-                    commands.extend(self._parse_uci_export_format(package, config_str))
+                commands.extend(self._parse_package_config(package, config_str))
 
             except Exception as e:
                 # If we can't get a package, just skip it
@@ -943,6 +1077,7 @@ class UCIConfig:
         show_remote_only: bool = True,
         remove_packages: Optional[List[str]] = None,
         verbose: bool = False,
+        remote_commands: Optional[List[UCICommand]] = None,
     ) -> ConfigDiff:
         """
         Compare this configuration with the remote device configuration.
@@ -957,95 +1092,120 @@ class UCIConfig:
                              go to remote_only. This overrides show_remote_only for the
                              specified packages.
             verbose: If True, show progress spinner while fetching remote config
+            remote_commands: Optional remote commands previously returned by
+                             _parse_remote_config(). When given, the remote device is not
+                             queried again, so callers that already fetched the remote
+                             configuration can reuse it.
 
         Returns:
             A ConfigDiff object describing the differences
         """
         local_commands = self.get_all_commands()
 
-        if verbose:
-            spinner = Spinner("Fetching remote configuration...")
-            spinner.start()
-            try:
-                remote_commands = self._parse_remote_config(ssh, spinner=spinner)
-                spinner.stop("✓ Remote configuration fetched")
-            except Exception:
-                spinner.stop("✗ Failed to fetch remote configuration")
-                raise
-        else:
-            remote_commands = self._parse_remote_config(ssh)
+        if remote_commands is None:
+            if verbose:
+                spinner = Spinner("Fetching remote configuration...")
+                spinner.start()
+                try:
+                    remote_commands = self._parse_remote_config(ssh, spinner=spinner)
+                    spinner.stop("✓ Remote configuration fetched")
+                except Exception:
+                    spinner.stop("✗ Failed to fetch remote configuration")
+                    raise
+            else:
+                remote_commands = self._parse_remote_config(ssh)
 
         diff = ConfigDiff()
 
         # Build section type mapping from commands (for logical path construction)
         section_types: Dict[str, Dict[str, str]] = {}  # {package: {section_name: section_type}}
         for cmd in local_commands + remote_commands:
-            parts = cmd.path.split(".")
-            if len(parts) == 2 and cmd.action == "set":
+            if cmd.path_depth == 2 and cmd.action == "set":
                 # This is a section definition: package.section = type
-                package = parts[0]
-                section_name = parts[1]
                 section_type = cmd.value if cmd.value else ""
-                if package not in section_types:
-                    section_types[package] = {}
-                section_types[package][section_name] = section_type
+                if cmd.package not in section_types:
+                    section_types[cmd.package] = {}
+                section_types[cmd.package][cast(str, cmd.section)] = section_type
 
         # Build section-level tracking for tree display
         for cmd in local_commands:
-            parts = cmd.path.split(".")
-            if len(parts) >= 2:
-                diff._local_sections.add((parts[0], parts[1]))
+            if cmd.section is not None:
+                diff._local_sections.add((cmd.package, cmd.section))
 
         for cmd in remote_commands:
-            parts = cmd.path.split(".")
-            if len(parts) >= 2:
-                diff._remote_sections.add((parts[0], parts[1]))
+            if cmd.section is not None:
+                diff._remote_sections.add((cmd.package, cmd.section))
 
-        # Create sets for comparison
+        # Hash indexes for comparison, built once so that every membership
+        # test below is O(1) instead of a scan over the other command list.
         # For add_list commands, we compare (path, value) pairs
-        # For set commands, we track path -> value mapping
-        local_set = {(cmd.path, cmd.value) for cmd in local_commands}
-        remote_set = {(cmd.path, cmd.value) for cmd in remote_commands}
-
-        # Track paths and their actions (set vs add_list)
-        local_paths_by_action = {}  # {path: action}
-        for cmd in local_commands:
-            if cmd.action == "set":
-                local_paths_by_action[cmd.path] = "set"
-            # For add_list, don't track as we want per-item comparison
+        # For set commands, we also index the remote command by path
+        # Each key is built once and reused by the set and by the loops below
+        local_key_list = [cmd.key() for cmd in local_commands]
+        remote_key_list = [cmd.key() for cmd in remote_commands]
+        local_keys = set(local_key_list)
+        remote_keys = set(remote_key_list)
+
+        # Built in reverse so the first remote command for a path wins, like a
+        # linear scan would find it
+        remote_set_by_path: Dict[str, UCICommand] = {
+            cmd.path: cmd for cmd in reversed(remote_commands) if cmd.action == "set"
+        }
 
         local_paths = {c.path for c in local_commands}
 
+        # Remote policy per package, resolved on first use
+        remote_policies: Dict[str, Optional[RemotePolicy]] = {}
+
+        # Whether each remote section is whitelisted as a whole, so options of
+        # such a section are kept without building and matching their paths
+        fully_whitelisted: Dict[Tuple[str, str], bool] = {}
+
+        def whitelist_keeps(cmd: UCICommand, policy: RemotePolicy) -> bool:
+            """Check a remote command against the whitelist of its package's policy."""
+            pkg_section_types = section_types.get(cmd.package, {})
+            if cmd.section is not None:
+                section_key = (cmd.package, cmd.section)
+                fully = fully_whitelisted.get(section_key)
+                if fully is None:
+                    section_path = self._get_logical_path(
+                        f"{cmd.package}.{cmd.section}", pkg_section_types, cmd.package
+                    )
+                    fully = policy.section_fully_whitelisted(section_path)
+                    fully_whitelisted[section_key] = fully
+                if fully:
+                    return True
+            logical_path = self._get_logical_path(cmd.path, pkg_section_types, cmd.package)
+            return policy.should_keep_remote_path(logical_path)
+
+        # Bucket appends are bound once instead of looked up per command
+        add_to_add = diff.to_add.append
+        add_to_modify = diff.to_modify.append
+        add_common = diff.common.append
+
         # Commands in local but not in remote
-        for cmd in local_commands:
-            key = (cmd.path, cmd.value)
-            if key not in remote_set:
+        for cmd, key in zip(local_commands, local_key_list):
+            if key not in remote_keys:
                 # For add_list commands, if the (path, value) pair doesn't exist, it's an addition
                 if cmd.action == "add_list":
-                    diff.to_add.append(cmd)
+                    add_to_add(cmd)
                 else:
                     # For set commands, check if path exists in remote with different value
-                    remote_paths = {c.path for c in remote_commands if c.action == "set"}
-                    if cmd.path in remote_paths:
-                        # Find the remote command with same path
-                        remote_cmd = next(
-                            c for c in remote_commands if c.path == cmd.path and c.action == "set"
-                        )
-                        diff.to_modify.append((remote_cmd, cmd))
+                    remote_cmd = remote_set_by_path.get(cmd.path)
+                    if remote_cmd is not None:
+                        add_to_modify((remote_cmd, cmd))
                     else:
-                        diff.to_add.append(cmd)
+                        add_to_add(cmd)
             else:
                 # Setting exists in both with same value
-                diff.common.append(cmd)
+                add_common(cmd)
 
         # Commands in remote but not in local
-        for cmd in remote_commands:
-            key = (cmd.path, cmd.value)
-            if key not in local_set:
+        for cmd, key in zip(remote_commands, remote_key_list):
+            if key not in local_keys:
                 # Determine if this command should be marked for removal
-                parts = cmd.path.split(".")
-                cmd_package = parts[0]
-                cmd_section = parts[1] if len(parts) >= 2 else ""
+                cmd_package = cmd.package
+                cmd_section = cmd.section or ""
                 should_remove = False
 
                 # Check if this section exists in local config
@@ -1053,7 +1213,9 @@ class UCIConfig:
                 section_is_remote_only = not section_in_local
 
                 # Check if the package has a remote policy
-                remote_policy = self.get_remote_policy(cmd_package)
+                if cmd_package not in remote_policies:
+                    remote_policies[cmd_package] = self.get_remote_policy(cmd_package)
+                remote_policy = remote_policies[cmd_package]
                 is_whitelisted = False
 
                 if remote_policy is not None:
@@ -1062,12 +1224,8 @@ class UCIConfig:
                         # Section only exists on remote - apply remote policy
                         # Use new whitelist approach if configured, otherwise fall back to legacy
                         if remote_policy.whitelist:
-                            # New whitelist approach - construct logical path
-                            pkg_section_types = section_types.get(cmd_package, {})
-                            logical_path = self._get_logical_path(
-                                cmd.path, pkg_section_types, cmd_package
-                            )
-                            if remote_policy.should_keep_remote_path(logical_path):
+                            # New whitelist approach - match the logical path
+                            if whitelist_keeps(cmd, remote_policy):
                                 is_whitelisted = True
                             else:
                                 should_remove = True
@@ -1089,11 +1247,7 @@ class UCIConfig:
                         # UNLESS they are whitelisted
                         if remote_policy.whitelist:
                             # Check if this specific path is whitelisted
-                            pkg_section_types = section_types.get(cmd_package, {})
-                            logical_path = self._get_logical_path(
-                                cmd.path, pkg_section_types, cmd_package
-                            )
-                            if remote_policy.should_keep_remote_path(logical_path):
+                            if whitelist_keeps(cmd, remote_policy):
                                 is_whitelisted = True
                             else:
                                 should_remove = True
@@ -1149,19 +1303,15 @@ class UCIConfig:
         commands = self.get_all_commands()
 
         # Determine which packages are being configured
-        changed_packages: set[str] = set()
-        for cmd in commands:
-            parts = cmd.path.split(".")
-            if parts:
-                changed_packages.add(parts[0])
+        changed_packages = {cmd.package for cmd in commands}
 
         if dry_run:
             print("[Dry run mode - no changes made]")
             if not commands:
                 print("No commands to execute.")
                 return
-            for cmd in commands:
-                print(f"Would run: {cmd.to_string()}")
+            # One write for the whole listing instead of a print() per command
+            print("\n".join(f"Would run: {cmd.to_string()}" for cmd in commands))
             if auto_commit and commands:
                 print("Would run: uci commit")
             if auto_reload and commands:
@@ -1189,9 +1339,8 @@ class UCIConfig:
             # Execute commands
             for cmd in commands:
                 if progress:
-                    parts = cmd.path.split(".")
-                    if len(parts) >= 2:
-                        progress.update(message=f"Applying {parts[0]}.{parts[1]}")
+                    if cmd.section is not None:
+                        progress.update(message=f"Applying {cmd.package}.{cmd.section}")
                     else:
                         progress.update()
 
@@ -1321,8 +1470,8 @@ class UCIConfig:
             if not commands_to_run:
                 print("No commands to execute.")
                 return diff
-            for cmd in commands_to_run:
-                print(f"Would run: {cmd.to_string()}")
+            # One write for the whole listing instead of a print() per command
+            print("\n".join(f"Would run: {cmd.to_string()}" for cmd in commands_to_run))
             if auto_commit and commands_to_run:
                 print("Would run: uci commit")
             if auto_reload and commands_to_run:
@@ -1355,9 +1504,8 @@ class UCIConfig:
             for i, cmd in enumerate(commands_to_run):
                 if progress:
                     # Extract a short description of what we're doing
-                    parts = cmd.path.split(".")
-                    if len(parts) >= 2:
-                        progress.update(message=f"Applying {parts[0]}.{parts[1]}")
+                    if cmd.section is not None:
+                        progress.update(message=f"Applying {cmd.package}.{cmd.section}")
                     else:
                         progress.update()
 
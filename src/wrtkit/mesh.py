@@ -1,13 +1,18 @@
 """Mesh network information collection and visualization."""
 
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Dict, List, Literal, Optional
+from typing import Dict, List, Literal, Optional, Union
 
 from pydantic import BaseModel
 
 from .ssh import SSHConnection
 
+# Upper bound on nodes polled at once by collect_mesh_network(), so a large
+# mesh does not start one thread and one SSH handshake per host at the same time
+_MAX_COLLECT_WORKERS = 8
+
 
 class Client(BaseModel):
     """Represents a connected client/device."""
@@ -775,8 +780,7 @@ def collect_mesh_network(
     raw_data: List[Optional[_NodeRawData]] = []
     errors: Dict[str, str] = {}
 
-    # Phase 1: Collect raw data from all nodes
-    for host in all_hosts:
+    def collect(host: str) -> Union[_NodeRawData, Exception]:
         try:
             connection = SSHConnection(
                 host=host,
@@ -787,10 +791,21 @@ def collect_mesh_network(
                 timeout=timeout,
             )
             with connection:
-                raw_data.append(_collect_node_raw_data(connection))
+                return _collect_node_raw_data(connection)
         except Exception as e:
+            return e
+
+    # Phase 1: Collect raw data from all nodes. Each node has its own connection,
+    # so they are polled in parallel, a bounded number at a time.
+    with ThreadPoolExecutor(max_workers=min(len(all_hosts), _MAX_COLLECT_WORKERS)) as executor:
+        results = list(executor.map(collect, all_hosts))
+
+    for host, result in zip(all_hosts, results):
+        if isinstance(result, Exception):
             raw_data.append(None)
-            errors[host] = str(e)
+            errors[host] = str(result)
+        else:
+            raw_data.append(result)
 
     # Phase 2: Collect all WiFi MACs from all nodes (for deduplication)
     all_wifi_macs: set = set()
@@ -3,7 +3,12 @@
 import serial
 import time
 import re
-from typing import Optional, Tuple, List, Any
+from typing import Optional, Tuple, List, Any, Dict
+
+# Marker line printed ahead of each package's output by get_uci_configs()
+_EXPORT_MARKER_RE = re.compile(r"^@@uci-(export|failed) (\S+)$")
+# Marker line printed by get_uci_configs() once every package was exported
+_EXPORT_DONE_MARKER = "@@uci-done"
 
 
 class SerialConnection:
@@ -152,12 +157,13 @@ class SerialConnection:
             self._serial = None
             self._is_logged_in = False
 
-    def execute(self, command: str) -> Tuple[str, str, int]:
+    def execute(self, command: str, timeout: Optional[float] = None) -> Tuple[str, str, int]:
         """
         Execute a command on the remote device.
 
         Args:
             command: The command to execute
+            timeout: Seconds to wait for the command's output (default: self.timeout)
 
         Returns:
             Tuple of (stdout, stderr, exit_code)
@@ -175,7 +181,7 @@ class SerialConnection:
         time.sleep(0.2)
 
         # Wait for command output and prompt
-        output = self._wait_for_prompt()
+        output = self._wait_for_prompt(timeout)
 
         # Remove the echoed command from the output
         lines = output.split("\n")
@@ -234,6 +240,65 @@ class SerialConnection:
             raise RuntimeError(f"Failed to get UCI config for {package}: {stderr}")
         return stdout
 
+    def get_uci_configs(self, packages: List[str]) -> Dict[str, str]:
+        """
+        Retrieve the current UCI configuration of several packages in one command.
+
+        Every command over the console costs a prompt round-trip plus an exit
+        code query, so the packages are exported by a single shell loop and
+        split apart again using a marker line printed before each one. A final
+        marker confirms that the output was read to the end.
+
+        Args:
+            packages: The UCI package names (e.g., ['network', 'wireless'])
+
+        Returns:
+            Mapping of package name to its configuration text. Packages that
+            could not be exported (e.g. not installed) are left out.
+
+        Raises:
+            RuntimeError: If the output was cut off before every package was
+                exported, e.g. because the read timed out
+        """
+        names = " ".join(packages)
+        # The packages share one read, so allow each its own timeout
+        stdout, _, _ = self.execute(
+            f'for p in {names}; do echo "@@uci-export $p"; '
+            f'uci export "$p" 2>/dev/null || echo "@@uci-failed $p"; done; '
+            f'echo "{_EXPORT_DONE_MARKER}"',
+            timeout=self.timeout * len(packages),
+        )
+
+        sections: Dict[str, List[str]] = {}
+        failed = set()
+        current: Optional[List[str]] = None
+        complete = False
+        for line in stdout.split("\n"):
+            stripped = line.strip()
+            if stripped == _EXPORT_DONE_MARKER:
+                complete = True
+                break
+            marker = _EXPORT_MARKER_RE.match(stripped)
+            if marker is not None and marker.group(2) in packages:
+                if marker.group(1) == "export":
+                    current = sections.setdefault(marker.group(2), [])
+                else:
+                    failed.add(marker.group(2))
+                    current = None
+            elif current is not None:
+                current.append(line)
+
+        if not complete:
+            raise RuntimeError(
+                f"Output of UCI export for {names} was cut off before all packages were read"
+            )
+
+        return {
+            package: "\n".join(lines).strip()
+            for package, lines in sections.items()
+            if package not in failed
+        }
+
     def commit_changes(self, packages: Optional[List[str]] = None) -> None:
         """
         Commit UCI changes.
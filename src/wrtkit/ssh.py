@@ -1,9 +1,11 @@
 """SSH connection management for remote OpenWRT devices."""
 
-import paramiko
-from typing import Optional, Tuple, List, Set
+from typing import TYPE_CHECKING, Optional, Tuple, List, Set
 import time
 
+if TYPE_CHECKING:
+    import paramiko
+
 
 class SSHConnection:
     """Manages SSH connections to OpenWRT devices."""
@@ -34,13 +36,17 @@ class SSHConnection:
         self.password = password
         self.key_filename = key_filename
         self.timeout = timeout
-        self._client: Optional[paramiko.SSHClient] = None
+        self._client: Optional["paramiko.SSHClient"] = None
 
     def connect(self) -> None:
         """Establish SSH connection to the device."""
         if self._client is not None:
             return
 
+        # paramiko is slow to import (cryptography backend setup), so it is
+        # only loaded once a connection is actually opened
+        import paramiko
+
         self._client = paramiko.SSHClient()
         self._client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
@@ -77,13 +83,13 @@ class SSHConnection:
             self.connect()
 
         stdin, stdout, stderr = self._client.exec_command(command)
+        # Drain the output before waiting for the exit status: a command whose
+        # output exceeds the channel window would otherwise block forever.
+        out = stdout.read().decode("utf-8")
+        err = stderr.read().decode("utf-8")
         exit_code = stdout.channel.recv_exit_status()
 
-        return (
-            stdout.read().decode("utf-8"),
-            stderr.read().decode("utf-8"),
-            exit_code,
-        )
+        return (out, err, exit_code)
 
     def execute_uci_command(self, command: str) -> Tuple[str, str, int]:
         """
@@ -0,0 +1,17 @@
+"""Shared test doubles for wrtkit tests."""
+
+from typing import Dict
+
+
+class StaticMockSSH:
+    """
+    Stand-in for SSHConnection that serves canned 'uci' output.
+
+    Subclasses set ``packages`` to a mapping of package name to the text
+    returned for it; unknown packages return an empty configuration.
+    """
+
+    packages: Dict[str, str] = {}
+
+    def get_uci_config(self, package: str) -> str:
+        return self.packages.get(package, "")
@@ -1,6 +1,9 @@
 """Tests for the main UCI configuration."""
 
-from wrtkit import UCIConfig
+from wrtkit import SSHConnection, UCIConfig
+from wrtkit.config import fetch_uci_configs
+
+from .fixtures import StaticMockSSH
 
 
 def test_config_to_script():
@@ -77,10 +80,18 @@ def test_get_all_commands():
     commands = config.get_all_commands()
 
     # Should have commands from all sections
-    assert any("network" in cmd.path for cmd in commands)
-    assert any("wireless" in cmd.path for cmd in commands)
-    assert any("dhcp" in cmd.path for cmd in commands)
-    assert any("firewall" in cmd.path for cmd in commands)
+    packages = {cmd.package for cmd in commands}
+    assert "network" in packages
+    assert "wireless" in packages
+    assert "dhcp" in packages
+    assert "firewall" in packages
+
+    # Per-package lookup returns the same commands without filtering by path
+    for package in ("network", "wireless", "dhcp", "firewall", "sqm"):
+        assert config.get_commands_by_package(package) == [
+            cmd for cmd in commands if cmd.package == package
+        ]
+    assert config.get_commands_by_package("system") == []
 
 
 def test_uci_command_to_string():
@@ -96,6 +107,13 @@ def test_uci_command_to_string():
     cmd_delete = UCICommand("delete", "network.old_interface", None)
     assert cmd_delete.to_string() == "uci delete network.old_interface"
 
+    # Single quotes in values are escaped for the shell
+    cmd_quoted = UCICommand("set", "wireless.guest.ssid", "Bob's WiFi")
+    assert cmd_quoted.to_string() == "uci set wireless.guest.ssid='Bob'\\''s WiFi'"
+    assert cmd_quoted.to_string_with_value("Bob's ***") == (
+        "uci set wireless.guest.ssid='Bob'\\''s ***'"
+    )
+
 
 def test_config_diff_remote_only():
     """Test that diff tracks remote-only UCI settings."""
@@ -205,6 +223,9 @@ def test_config_diff_empty():
     assert diff.to_string(color=False) == "No differences found."
     assert diff.to_tree(color=False) == "No differences found."
 
+    # Slotted, so there is no per-instance __dict__
+    assert not hasattr(diff, "__dict__")
+
 
 def test_parse_uci_show_format():
     """Test parsing UCI show format (as opposed to UCI export format)."""
@@ -239,11 +260,11 @@ config device 'br_lan'
     assert len(commands) > 0
 
     # Check section definitions
-    sections = [cmd for cmd in commands if len(cmd.path.split(".")) == 2]
+    sections = [cmd for cmd in commands if cmd.path_depth == 2]
     assert len(sections) == 3  # loopback, lan, br_lan
 
     # Check options
-    options = [cmd for cmd in commands if cmd.action == "set" and len(cmd.path.split(".")) == 3]
+    options = [cmd for cmd in commands if cmd.action == "set" and cmd.path_depth == 3]
     assert len(options) >= 6  # Various options
 
     # Check list items
@@ -251,7 +272,7 @@ config device 'br_lan'
     assert len(lists) == 3  # ipaddr list + 2 ports
 
     # Verify specific commands
-    paths = [cmd.path for cmd in commands]
+    paths = {cmd.path for cmd in commands}
     assert "network.loopback" in paths
     assert "network.lan.ipaddr" in paths
     assert "network.br_lan.ports" in paths
@@ -278,34 +299,39 @@ network.lan.ipaddr='192.168.10.1'
     assert len(commands) == 7
 
     # Check section definitions
-    sections = [cmd for cmd in commands if len(cmd.path.split(".")) == 2]
+    sections = [cmd for cmd in commands if cmd.path_depth == 2]
     assert len(sections) == 2  # loopback, lan
 
     # Check options
-    options = [cmd for cmd in commands if len(cmd.path.split(".")) == 3]
+    options = [cmd for cmd in commands if cmd.path_depth == 3]
     assert len(options) == 5  # device, proto, device, proto, ipaddr
 
     # Verify specific values
     ipaddr_cmd = next(cmd for cmd in commands if cmd.path == "network.lan.ipaddr")
     assert ipaddr_cmd.value == "192.168.10.1"
 
+    # CRLF line endings parse the same as plain newlines
+    crlf_commands = config._parse_uci_export_format(
+        "network", uci_export_output.replace("\n", "\r\n")
+    )
+    assert [cmd.key() for cmd in crlf_commands] == [cmd.key() for cmd in commands]
+
 
 def test_config_diff_common_settings():
     """Test that diff tracks common settings between local and remote."""
     from wrtkit.config import UCIConfig
 
     # Create a mock SSH connection
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "network":
-                return """network.lan=interface
+    class MockSSH(StaticMockSSH):
+        packages = {
+            "network": """network.lan=interface
 network.lan.ipaddr='192.168.1.1'
 network.lan.netmask='255.255.255.0'
 network.wan=interface
 network.wan.proto='dhcp'
 network.guest=interface
-network.guest.proto='static'"""
-            return ""
+network.guest.proto='static'""",
+        }
 
     config = UCIConfig()
     # Add some local config that matches remote
@@ -341,17 +367,16 @@ def test_config_diff_list_items():
     from wrtkit.config import UCIConfig
 
     # Create a mock SSH connection with list items
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "network":
-                return """config device 'br_lan'
+    class MockSSH(StaticMockSSH):
+        packages = {
+            "network": """config device 'br_lan'
 	option name 'br-lan'
 	option type 'bridge'
 	list ports 'lan1'
 	list ports 'lan2'
 	list ports 'lan3'
-"""
-            return ""
+""",
+        }
 
     config = UCIConfig()
     # Add local config with some overlapping and some different list items
@@ -384,7 +409,7 @@ def test_config_diff_list_items():
     assert to_add_ports[0].value == "bat0.10"
 
     assert len(remote_only_ports) == 2
-    assert set(cmd.value for cmd in remote_only_ports) == {"lan2", "lan3"}
+    assert {cmd.value for cmd in remote_only_ports} == {"lan2", "lan3"}
 
     assert len(common_ports) == 1
     assert common_ports[0].value == "lan1"
@@ -526,14 +551,13 @@ def test_config_diff_with_show_remote_only_false():
     """Test that diff with show_remote_only=False puts remote items in to_remove."""
     from wrtkit.config import UCIConfig
 
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "network":
-                return """network.lan=interface
+    class MockSSH(StaticMockSSH):
+        packages = {
+            "network": """network.lan=interface
 network.lan.ipaddr='192.168.1.1'
 network.guest=interface
-network.guest.proto='dhcp'"""
-            return ""
+network.guest.proto='dhcp'""",
+        }
 
     config = UCIConfig()
     from wrtkit.network import NetworkInterface
@@ -574,22 +598,19 @@ def test_config_diff_per_package_removal():
     """Test diff with per-package removal (remove_packages parameter)."""
     from wrtkit.config import UCIConfig
 
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "network":
-                return """network.lan=interface
+    class MockSSH(StaticMockSSH):
+        packages = {
+            "network": """network.lan=interface
 network.lan.ipaddr='192.168.1.1'
 network.guest=interface
-network.guest.proto='dhcp'"""
-            elif package == "wireless":
-                return """wireless.radio0=wifi-device
+network.guest.proto='dhcp'""",
+            "wireless": """wireless.radio0=wifi-device
 wireless.radio0.channel='11'
 wireless.old_wifi=wifi-iface
-wireless.old_wifi.ssid='OldNetwork'"""
-            elif package == "firewall":
-                return """firewall.@zone[0]=zone
-firewall.@zone[0].name='lan'"""
-            return ""
+wireless.old_wifi.ssid='OldNetwork'""",
+            "firewall": """firewall.@zone[0]=zone
+firewall.@zone[0].name='lan'""",
+        }
 
     config = UCIConfig()
     from wrtkit.network import NetworkInterface
@@ -654,18 +675,15 @@ def test_config_diff_multiple_packages_removal():
     """Test diff with multiple packages marked for removal."""
     from wrtkit.config import UCIConfig
 
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "network":
-                return """network.guest=interface
-network.guest.proto='dhcp'"""
-            elif package == "wireless":
-                return """wireless.old_wifi=wifi-iface
-wireless.old_wifi.ssid='OldNetwork'"""
-            elif package == "dhcp":
-                return """dhcp.guest=dhcp
-dhcp.guest.interface='guest'"""
-            return ""
+    class MockSSH(StaticMockSSH):
+        packages = {
+            "network": """network.guest=interface
+network.guest.proto='dhcp'""",
+            "wireless": """wireless.old_wifi=wifi-iface
+wireless.old_wifi.ssid='OldNetwork'""",
+            "dhcp": """dhcp.guest=dhcp
+dhcp.guest.interface='guest'""",
+        }
 
     config = UCIConfig()
 
@@ -726,6 +744,10 @@ def test_remote_policy_section_patterns():
     assert not policy.is_section_allowed("radio10")  # ? matches single char
     assert not policy.is_section_allowed("guest")
 
+    # Compiled patterns follow changes to the policy's pattern list
+    policy.allowed_sections.append("guest")
+    assert policy.is_section_allowed("guest")
+
 
 def test_remote_policy_value_filtering():
     """Test RemotePolicy value filtering."""
@@ -792,16 +814,15 @@ def test_remote_policy_diff_with_allowed_sections():
     """Test that diff respects remote_policy allowed_sections."""
     from wrtkit import UCIConfig, RemotePolicy
 
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "network":
-                return """network.lan=interface
+    class MockSSH(StaticMockSSH):
+        packages = {
+            "network": """network.lan=interface
 network.lan.ipaddr='192.168.1.1'
 network.guest=interface
 network.guest.proto='dhcp'
 network.temp_test=interface
-network.temp_test.proto='static'"""
-            return ""
+network.temp_test.proto='static'""",
+        }
 
     config = UCIConfig()
     from wrtkit.network import NetworkInterface
@@ -829,16 +850,15 @@ def test_remote_policy_diff_with_wildcard():
     """Test that remote_policy with wildcard keeps all remote sections."""
     from wrtkit import UCIConfig, RemotePolicy
 
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "network":
-                return """network.lan=interface
+    class MockSSH(StaticMockSSH):
+        packages = {
+            "network": """network.lan=interface
 network.lan.ipaddr='192.168.1.1'
 network.guest=interface
 network.guest.proto='dhcp'
 network.temp=interface
-network.temp.proto='static'"""
-            return ""
+network.temp.proto='static'""",
+        }
 
     config = UCIConfig()
     from wrtkit.network import NetworkInterface
@@ -866,19 +886,18 @@ def test_remote_policy_diff_with_list_values():
     """
     from wrtkit import UCIConfig, RemotePolicy
 
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "network":
-                # remote_device is a remote-only section (not in local config)
-                return """config device 'remote_device'
+    class MockSSH(StaticMockSSH):
+        packages = {
+            # remote_device is a remote-only section (not in local config)
+            "network": """config device 'remote_device'
 	option name 'remote-dev'
 	option type 'bridge'
 	list ports 'lan1'
 	list ports 'lan2'
 	list ports 'bat0'
 	list ports 'wlan0'
-"""
-            return ""
+""",
+        }
 
     config = UCIConfig()
     # No local device - remote_device is remote-only
@@ -894,14 +913,14 @@ def test_remote_policy_diff_with_list_values():
         cmd for cmd in diff.remote_only if cmd.action == "add_list" and "ports" in cmd.path
     ]
     assert len(remote_ports) == 2
-    assert set(cmd.value for cmd in remote_ports) == {"lan1", "lan2"}
+    assert {cmd.value for cmd in remote_ports} == {"lan1", "lan2"}
 
     # bat0 and wlan0 should be in to_remove (not allowed by value pattern)
     remove_ports = [
         cmd for cmd in diff.to_remove if cmd.action == "add_list" and "ports" in cmd.path
     ]
     assert len(remove_ports) == 2
-    assert set(cmd.value for cmd in remove_ports) == {"bat0", "wlan0"}
+    assert {cmd.value for cmd in remove_ports} == {"bat0", "wlan0"}
 
 
 def test_remote_policy_list_values_in_local_section():
@@ -912,17 +931,16 @@ def test_remote_policy_list_values_in_local_section():
     """
     from wrtkit import UCIConfig, RemotePolicy
 
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "network":
-                return """config device 'br_lan'
+    class MockSSH(StaticMockSSH):
+        packages = {
+            "network": """config device 'br_lan'
 	option name 'br-lan'
 	option type 'bridge'
 	list ports 'lan1'
 	list ports 'lan2'
 	list ports 'bat0'
-"""
-            return ""
+""",
+        }
 
     config = UCIConfig()
     from wrtkit.network import NetworkDevice
@@ -945,7 +963,7 @@ def test_remote_policy_list_values_in_local_section():
         cmd for cmd in diff.to_remove if cmd.action == "add_list" and "ports" in cmd.path
     ]
     assert len(remove_ports) == 2
-    assert set(cmd.value for cmd in remove_ports) == {"lan2", "bat0"}
+    assert {cmd.value for cmd in remove_ports} == {"lan2", "bat0"}
 
     # lan1 should be in common (matches local)
     common_ports = [cmd for cmd in diff.common if cmd.action == "add_list" and "ports" in cmd.path]
@@ -1002,18 +1020,17 @@ def test_remote_policy_removes_extra_options_in_local_section():
     """
     from wrtkit import UCIConfig, RemotePolicy
 
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "dhcp":
-                # Remote has monoprice section with extra options not in local
-                return """dhcp.monoprice=host
+    class MockSSH(StaticMockSSH):
+        packages = {
+            # Remote has monoprice section with extra options not in local
+            "dhcp": """dhcp.monoprice=host
 dhcp.monoprice.mac='AA:BB:CC:DD:EE:FF'
 dhcp.monoprice.ip='192.168.1.100'
 dhcp.monoprice.hostname='monoprice'
 dhcp.monoprice.force='1'
 dhcp.other_host=host
-dhcp.other_host.mac='11:22:33:44:55:66'"""
-            return ""
+dhcp.other_host.mac='11:22:33:44:55:66'""",
+        }
 
     config = UCIConfig()
     from wrtkit.dhcp import DHCPHost
@@ -1048,17 +1065,16 @@ def test_remote_policy_with_mixed_local_and_remote_sections():
     """Test remote_policy with a mix of local-managed and remote-only sections."""
     from wrtkit import UCIConfig, RemotePolicy
 
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "network":
-                return """network.lan=interface
+    class MockSSH(StaticMockSSH):
+        packages = {
+            "network": """network.lan=interface
 network.lan.ipaddr='192.168.1.1'
 network.lan.gateway='192.168.1.254'
 network.guest=interface
 network.guest.proto='dhcp'
 network.temp=interface
-network.temp.proto='static'"""
-            return ""
+network.temp.proto='static'""",
+        }
 
     config = UCIConfig()
     from wrtkit.network import NetworkInterface
@@ -1085,3 +1101,293 @@ network.temp.proto='static'"""
     remote_only_paths = [cmd.path for cmd in diff.remote_only]
     assert "network.guest" in remote_only_paths
     assert "network.guest.proto" in remote_only_paths
+
+
+def test_uci_command_path_depth_and_cached_string():
+    """Test derived UCICommand attributes."""
+    from wrtkit.base import UCICommand
+
+    section = UCICommand("set", "network.lan", "interface")
+    option = UCICommand("set", "network.lan.ipaddr", "192.168.1.1")
+    assert section.path_depth == 2
+    assert option.path_depth == 3
+
+    # The rendered string is computed once and reused
+    assert option.to_string() is option.to_string()
+
+    # Paths built at runtime are interned
+    other = UCICommand("set", ".".join(["network", "lan", "ipaddr"]), "10.0.0.1")
+    assert other.path is option.path
+
+
+def test_uci_command_key():
+    """Test the key used to match commands when diffing."""
+    from wrtkit.base import UCICommand
+
+    cmd = UCICommand("set", "network.lan.ipaddr", "192.168.1.1")
+    assert cmd.key() == ("network.lan.ipaddr", "192.168.1.1")
+    assert cmd.key() == UCICommand("set", "network.lan.ipaddr", "192.168.1.1").key()
+    assert cmd.key() != UCICommand("set", "network.lan.ipaddr", "10.0.0.1").key()
+
+
+def test_config_diff_reuses_remote_commands():
+    """Test that diff can reuse already-parsed remote commands."""
+    from wrtkit.config import UCIConfig
+    from wrtkit.network import NetworkInterface
+
+    class MockSSH:
+        def __init__(self):
+            self.calls = 0
+
+        def get_uci_config(self, package: str) -> str:
+            self.calls += 1
+            if package == "network":
+                return """network.lan=interface
+network.lan.ipaddr='192.168.1.1'"""
+            return ""
+
+    config = UCIConfig()
+    config.network.add_interface(NetworkInterface("lan").with_ipaddr("192.168.1.10"))
+
+    ssh = MockSSH()
+    remote = config._parse_remote_config(ssh)
+    fetches = ssh.calls
+
+    diff = config.diff(ssh, remote_commands=remote)
+
+    assert ssh.calls == fetches
+    assert len(diff.to_modify) == 1
+    assert diff.to_modify[0][0].value == "192.168.1.1"
+
+
+def test_parse_remote_config_fetches_packages_concurrently():
+    """Test that SSH package fetches run on worker threads and keep package order."""
+    import threading
+
+    from wrtkit.config import UCIConfig
+    from wrtkit.ssh import SSHConnection
+
+    class FakeSSH(SSHConnection):
+        def __init__(self):
+            super().__init__("192.0.2.1")
+            self.threads = set()
+
+        def connect(self):
+            pass
+
+        def get_uci_config(self, package: str) -> str:
+            self.threads.add(threading.current_thread().name)
+            if package == "sqm":
+                raise RuntimeError("not installed")
+            return f"{package}.main=section\n{package}.main.option='{package}'"
+
+    ssh = FakeSSH()
+    commands = UCIConfig()._parse_remote_config(ssh)
+
+    assert threading.current_thread().name not in ssh.threads
+    assert [cmd.path for cmd in commands if cmd.path_depth == 2] == [
+        "network.main",
+        "wireless.main",
+        "dhcp.main",
+        "firewall.main",
+    ]
+
+
+def test_parse_remote_config_uses_batch_fetch():
+    """Test that connections with get_uci_configs() export all packages in one call."""
+
+    class BatchMockSSH(StaticMockSSH):
+        packages = {"network": "network.lan=interface\nnetwork.lan.proto='static'"}
+
+        def __init__(self):
+            self.batches = []
+
+        def get_uci_config(self, package: str) -> str:
+            raise AssertionError("per-package fetch should not be used")
+
+        def get_uci_configs(self, packages):
+            self.batches.append(list(packages))
+            # Packages that cannot be exported are left out
+            return {p: self.packages[p] for p in packages if p in self.packages}
+
+    ssh = BatchMockSSH()
+    fetched = fetch_uci_configs(ssh, ["network", "sqm"])  # type: ignore[arg-type]
+
+    assert ssh.batches == [["network", "sqm"]]
+    assert fetched["network"] == BatchMockSSH.packages["network"]
+    assert isinstance(fetched["sqm"], RuntimeError)
+
+    commands = UCIConfig()._parse_remote_config(ssh)  # type: ignore[arg-type]
+    assert [cmd.path for cmd in commands] == ["network.lan", "network.lan.proto"]
+    assert len(ssh.batches) == 2
+
+
+def test_parse_remote_config_skips_packages_when_unreachable(capsys):
+    """Test that an unreachable host warns and skips each package instead of raising."""
+
+    class UnreachableSSH(SSHConnection):
+        def connect(self) -> None:
+            raise ConnectionError(f"Failed to connect to {self.host}: timed out")
+
+    ssh = UnreachableSSH("192.0.2.1")
+    fetched = fetch_uci_configs(ssh, ["network", "wireless"])
+
+    assert all(isinstance(error, ConnectionError) for error in fetched.values())
+    assert UCIConfig()._parse_remote_config(ssh) == []
+    output = capsys.readouterr().out
+    assert "Could not retrieve network config: Failed to connect to 192.0.2.1" in output
+    # Optional packages stay quiet
+    assert "sqm" not in output
+
+
+def test_fetch_uci_configs_bounds_concurrent_channels():
+    """Test that more packages than the worker cap are all fetched, a few at a time."""
+    import threading
+    import time
+
+    from wrtkit.config import _MAX_FETCH_WORKERS
+
+    class CountingSSH(SSHConnection):
+        def __init__(self):
+            super().__init__("192.0.2.1")
+            self.lock = threading.Lock()
+            self.active = 0
+            self.peak = 0
+
+        def connect(self) -> None:
+            pass
+
+        def get_uci_config(self, package: str) -> str:
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(0.01)
+            with self.lock:
+                self.active -= 1
+            return f"{package}.main=section"
+
+    packages = [f"pkg{i}" for i in range(_MAX_FETCH_WORKERS * 3)]
+    ssh = CountingSSH()
+    fetched = fetch_uci_configs(ssh, packages)
+
+    assert fetched == {package: f"{package}.main=section" for package in packages}
+    assert 1 <= ssh.peak <= _MAX_FETCH_WORKERS
+
+
+def test_parse_remote_config_detects_format_from_leading_token():
+    """Test that a value containing 'config ' does not switch the parser format."""
+
+    class MockSSH(StaticMockSSH):
+        packages = {
+            "network": """network.lan=interface
+network.lan.description='config for lan'
+""",
+        }
+
+    config = UCIConfig()
+    commands = config._parse_remote_config(MockSSH())  # type: ignore[arg-type]
+
+    assert [cmd.path for cmd in commands] == ["network.lan", "network.lan.description"]
+    assert commands[1].value == "config for lan"
+
+
+def test_config_diff_get_changed_packages():
+    """Test that changed packages are collected from adds, removals and modifications."""
+    from wrtkit.base import UCICommand
+    from wrtkit.config import ConfigDiff
+
+    diff = ConfigDiff()
+    diff.to_add = [UCICommand("set", "network.lan.ipaddr", "192.168.1.1")]
+    diff.to_remove = [UCICommand("set", "wireless.old_wifi", "wifi-iface")]
+    diff.to_modify = [
+        (UCICommand("set", "dhcp.lan.start", "100"), UCICommand("set", "dhcp.lan.start", "50"))
+    ]
+    diff.remote_only = [UCICommand("set", "firewall.wan", "zone")]
+
+    assert diff.get_changed_packages() == {"network", "wireless", "dhcp"}
+
+
+def test_config_diff_render_cache():
+    """Test that rendered output is reused until the diff changes."""
+    from wrtkit.base import UCICommand
+    from wrtkit.config import ConfigDiff
+
+    diff = ConfigDiff()
+    diff.to_add = [UCICommand("set", "network.lan.ipaddr", "192.168.1.1")]
+
+    tree = diff.to_tree(color=False)
+    assert diff.to_tree(color=False) is tree
+    assert diff.to_tree(color=True) != tree
+    assert diff.to_string(color=False) is diff.to_string(color=False)
+
+    # In-place mutation invalidates the cached rendering
+    diff.to_add.append(UCICommand("set", "network.lan.netmask", "255.255.255.0"))
+    updated = diff.to_tree(color=False)
+    assert updated is not tree
+    assert "netmask = 255.255.255.0" in updated
+
+
+def test_parse_package_config_lru_cache():
+    """Test that parsed packages are cached and evicted least recently used first."""
+    config = UCIConfig()
+    config.parse_cache_size = 2
+    calls = []
+    parse = config._parse_uci_export_format
+
+    def counting_parse(package, config_str):
+        calls.append(package)
+        return parse(package, config_str)
+
+    config._parse_uci_export_format = counting_parse  # type: ignore[method-assign]
+
+    network = "network.lan=interface\nnetwork.lan.proto='static'"
+    first = config._parse_package_config("network", network)
+    assert config._parse_package_config("network", network) == first
+    assert calls == ["network"]
+
+    config._parse_package_config("dhcp", "dhcp.lan=dhcp")
+    config._parse_package_config("network", network)  # refresh network
+    config._parse_package_config("firewall", "firewall.wan=zone")  # evicts dhcp
+    assert calls == ["network", "dhcp", "firewall"]
+
+    config._parse_package_config("dhcp", "dhcp.lan=dhcp")
+    assert calls == ["network", "dhcp", "firewall", "dhcp"]
+    assert len(config._parse_cache) == 2
+
+
+def test_uci_command_path_components():
+    """Test that UCICommand exposes its path split into package, section and option."""
+    from wrtkit.base import UCICommand
+
+    option = UCICommand("set", "wireless.default_radio0.ssid", "MyNetwork")
+    assert (option.package, option.section, option.option) == (
+        "wireless",
+        "default_radio0",
+        "ssid",
+    )
+
+    section = UCICommand("set", "wireless.default_radio0", "wifi-iface")
+    assert (section.package, section.section, section.option) == (
+        "wireless",
+        "default_radio0",
+        None,
+    )
+
+    # Package and section names are shared between commands
+    assert option.section is section.section
+
+    # Commands are slotted and carry no per-instance __dict__
+    assert not hasattr(option, "__dict__")
+
+
+def test_uci_command_hashable():
+    """Test that equal commands hash equally and deduplicate in sets."""
+    from wrtkit.base import UCICommand
+
+    a = UCICommand("add_list", "network.br_lan.ports", "lan1")
+    b = UCICommand("add_list", "network.br_lan.ports", "lan1")
+    c = UCICommand("del_list", "network.br_lan.ports", "lan1")
+
+    assert hash(a) == hash(b)
+    assert {a, b, c} == {a, c}
+    assert {a: 1}[b] == 1
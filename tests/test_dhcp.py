@@ -1,5 +1,7 @@
 """Tests for DHCP configuration."""
 
+import pytest
+
 from wrtkit.dhcp import DHCPConfig, DHCPSection, DHCPHost
 from wrtkit.base import UCICommand
 
@@ -18,14 +20,15 @@ def test_dhcp_configuration():
     dhcp.add_dhcp(section)
 
     commands = dhcp.get_commands()
+    keys = {cmd.key() for cmd in commands}
     assert len(commands) == 6
 
     assert commands[0] == UCICommand("set", "dhcp.lan", "dhcp")
-    assert any(cmd.path == "dhcp.lan.interface" and cmd.value == "lan" for cmd in commands)
-    assert any(cmd.path == "dhcp.lan.start" and cmd.value == "100" for cmd in commands)
-    assert any(cmd.path == "dhcp.lan.limit" and cmd.value == "150" for cmd in commands)
-    assert any(cmd.path == "dhcp.lan.leasetime" and cmd.value == "12h" for cmd in commands)
-    assert any(cmd.path == "dhcp.lan.ignore" and cmd.value == "0" for cmd in commands)
+    assert ("dhcp.lan.interface", "lan") in keys
+    assert ("dhcp.lan.start", "100") in keys
+    assert ("dhcp.lan.limit", "150") in keys
+    assert ("dhcp.lan.leasetime", "12h") in keys
+    assert ("dhcp.lan.ignore", "0") in keys
 
 
 def test_dhcp_disabled():
@@ -35,30 +38,42 @@ def test_dhcp_disabled():
     dhcp.add_dhcp(section)
 
     commands = dhcp.get_commands()
+    keys = {cmd.key() for cmd in commands}
 
-    assert any(cmd.path == "dhcp.guest.ignore" and cmd.value == "1" for cmd in commands)
+    assert ("dhcp.guest.ignore", "1") in keys
 
 
-def test_dhcp_host_static_lease():
-    """Test configuring a DHCP static lease (host)."""
-    dhcp = DHCPConfig()
-    host = (
-        DHCPHost("printer")
+@pytest.mark.parametrize(
+    "build_host",
+    [
+        lambda: DHCPHost("printer")
         .with_mac("aa:bb:cc:dd:ee:ff")
         .with_ip("192.168.1.50")
-        .with_name("printer")
-    )
+        .with_name("printer"),
+        lambda: DHCPHost("printer").with_static_lease(
+            mac="aa:bb:cc:dd:ee:ff", ip="192.168.1.50", name="printer"
+        ),
+    ],
+    ids=["field_builders", "with_static_lease"],
+)
+def test_dhcp_host_static_lease(build_host):
+    """Test configuring a DHCP static lease (host) with either builder style."""
+    dhcp = DHCPConfig()
+    host = build_host()
     dhcp.add_host(host)
 
+    assert host.mac == "aa:bb:cc:dd:ee:ff"
+    assert host.ip == "192.168.1.50"
+    assert host.name == "printer"
+
     commands = dhcp.get_commands()
+    keys = {cmd.key() for cmd in commands}
     assert len(commands) == 4
 
     assert commands[0] == UCICommand("set", "dhcp.printer", "host")
-    assert any(
-        cmd.path == "dhcp.printer.mac" and cmd.value == "aa:bb:cc:dd:ee:ff" for cmd in commands
-    )
-    assert any(cmd.path == "dhcp.printer.ip" and cmd.value == "192.168.1.50" for cmd in commands)
-    assert any(cmd.path == "dhcp.printer.name" and cmd.value == "printer" for cmd in commands)
+    assert ("dhcp.printer.mac", "aa:bb:cc:dd:ee:ff") in keys
+    assert ("dhcp.printer.ip", "192.168.1.50") in keys
+    assert ("dhcp.printer.name", "printer") in keys
 
 
 def test_dhcp_host_with_leasetime():
@@ -71,20 +86,10 @@ def test_dhcp_host_with_leasetime():
     )
 
     commands = host.get_commands()
+    keys = {cmd.key() for cmd in commands}
 
     assert commands[0] == UCICommand("set", "dhcp.nas", "host")
-    assert any(cmd.path == "dhcp.nas.leasetime" and cmd.value == "infinite" for cmd in commands)
-
-
-def test_dhcp_host_convenience_builder():
-    """Test the with_static_lease convenience method."""
-    host = DHCPHost("device").with_static_lease(
-        mac="aa:bb:cc:dd:ee:ff", ip="192.168.1.200", name="mydevice"
-    )
-
-    assert host.mac == "aa:bb:cc:dd:ee:ff"
-    assert host.ip == "192.168.1.200"
-    assert host.name == "mydevice"
+    assert ("dhcp.nas.leasetime", "infinite") in keys
 
 
 def test_dhcp_config_with_sections_and_hosts():
@@ -102,11 +107,12 @@ def test_dhcp_config_with_sections_and_hosts():
     dhcp.add_host(host2)
 
     commands = dhcp.get_commands()
+    keys = {cmd.key() for cmd in commands}
 
     # Should have section commands + host commands
-    assert any(cmd.path == "dhcp.lan" and cmd.value == "dhcp" for cmd in commands)
-    assert any(cmd.path == "dhcp.printer" and cmd.value == "host" for cmd in commands)
-    assert any(cmd.path == "dhcp.nas" and cmd.value == "host" for cmd in commands)
+    assert ("dhcp.lan", "dhcp") in keys
+    assert ("dhcp.printer", "host") in keys
+    assert ("dhcp.nas", "host") in keys
 
 
 def test_dhcp_host_field_aliases():
@@ -118,20 +124,18 @@ def test_dhcp_host_field_aliases():
     )
 
     commands = host.get_commands()
+    keys = {cmd.key() for cmd in commands}
+    paths = {cmd.path for cmd in commands}
 
     # Should generate commands with CORRECT option names (mac, ip, name)
-    assert any(
-        cmd.path == "dhcp.monoprice.mac" and cmd.value == "D4:AD:20:92:44:AA" for cmd in commands
-    )
-    assert any(cmd.path == "dhcp.monoprice.ip" and cmd.value == "192.168.10.99" for cmd in commands)
-    assert any(
-        cmd.path == "dhcp.monoprice.name" and cmd.value == "monoprice-con" for cmd in commands
-    )
+    assert ("dhcp.monoprice.mac", "D4:AD:20:92:44:AA") in keys
+    assert ("dhcp.monoprice.ip", "192.168.10.99") in keys
+    assert ("dhcp.monoprice.name", "monoprice-con") in keys
 
     # Should NOT generate commands with wrong option names
-    assert not any(cmd.path == "dhcp.monoprice.macaddr" for cmd in commands)
-    assert not any(cmd.path == "dhcp.monoprice.ipaddr" for cmd in commands)
-    assert not any(cmd.path == "dhcp.monoprice.hostname" for cmd in commands)
+    assert "dhcp.monoprice.macaddr" not in paths
+    assert "dhcp.monoprice.ipaddr" not in paths
+    assert "dhcp.monoprice.hostname" not in paths
 
     # Verify the model fields are using correct names
     assert host.mac == "D4:AD:20:92:44:AA"
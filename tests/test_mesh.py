@@ -0,0 +1,78 @@
+"""Tests for mesh network collection."""
+
+import threading
+import time
+
+import pytest
+
+from wrtkit import mesh
+from wrtkit.mesh import _MAX_COLLECT_WORKERS, _NodeRawData, collect_mesh_network
+
+
+class StubConnection:
+    """Stand-in for SSHConnection that never opens a socket."""
+
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def __init__(self, host: str, **kwargs):
+        self.host = host
+
+    def __enter__(self) -> "StubConnection":
+        if self.host == "down":
+            raise ConnectionError(f"Failed to connect to {self.host}: timed out")
+        with StubConnection.lock:
+            StubConnection.active += 1
+            StubConnection.peak = max(StubConnection.peak, StubConnection.active)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        with StubConnection.lock:
+            StubConnection.active -= 1
+
+
+def _stub_raw_data(connection: StubConnection) -> _NodeRawData:
+    time.sleep(0.01)
+    return _NodeRawData(
+        host=connection.host,
+        hostname=f"node-{connection.host}",
+        interface_ssids={},
+        wifi_clients=[],
+        arp_table={},
+        dhcp_leases={},
+        bridge_fdb={},
+        batman_tt={},
+    )
+
+
+@pytest.fixture
+def stub_connections(monkeypatch):
+    StubConnection.active = 0
+    StubConnection.peak = 0
+    monkeypatch.setattr(mesh, "SSHConnection", StubConnection)
+    monkeypatch.setattr(mesh, "_collect_node_raw_data", _stub_raw_data)
+
+
+def test_collect_mesh_network_reports_failed_host_and_keeps_others(stub_connections):
+    """Test that one unreachable node does not stop the others from being collected."""
+    network = collect_mesh_network("main", node_hosts=["down", "node1"])
+
+    assert [node.host for node in network.nodes] == ["main", "down", "node1"]
+    assert network.nodes[0].hostname == "node-main"
+    assert network.nodes[1].hostname == (
+        "(connection failed: Failed to connect to down: timed out)"
+    )
+    assert network.nodes[2].hostname == "node-node1"
+
+
+def test_collect_mesh_network_bounds_concurrent_connections(stub_connections):
+    """Test that more nodes than the worker cap are all collected, a few at a time."""
+    hosts = [f"node{i}" for i in range(_MAX_COLLECT_WORKERS * 2)]
+
+    network = collect_mesh_network("main", node_hosts=hosts)
+
+    assert [node.hostname for node in network.nodes] == [
+        f"node-{host}" for host in ["main"] + hosts
+    ]
+    assert 1 <= StubConnection.peak <= _MAX_COLLECT_WORKERS
@@ -64,12 +64,11 @@ def test_batadv_interface():
     net.add_interface(interface)
 
     commands = net.get_commands()
+    keys = {cmd.key() for cmd in commands}
 
-    assert any(
-        cmd.path == "network.bat0.routing_algo" and cmd.value == "BATMAN_IV" for cmd in commands
-    )
-    assert any(cmd.path == "network.bat0.gw_mode" and cmd.value == "server" for cmd in commands)
-    assert any(cmd.path == "network.bat0.hop_penalty" and cmd.value == "30" for cmd in commands)
+    assert ("network.bat0.routing_algo", "BATMAN_IV") in keys
+    assert ("network.bat0.gw_mode", "server") in keys
+    assert ("network.bat0.hop_penalty", "30") in keys
 
 
 def test_vlan_device():
@@ -86,9 +85,10 @@ def test_vlan_device():
     net.add_device(device)
 
     commands = net.get_commands()
+    keys = {cmd.key() for cmd in commands}
 
-    assert any(cmd.path == "network.bat0_vlan10.type" and cmd.value == "8021q" for cmd in commands)
-    assert any(cmd.path == "network.bat0_vlan10.vid" and cmd.value == "10" for cmd in commands)
+    assert ("network.bat0_vlan10.type", "8021q") in keys
+    assert ("network.bat0_vlan10.vid", "10") in keys
 
 
 def test_bridge_vlan_creation():
@@ -107,25 +107,31 @@ def test_bridge_vlan_creation():
     net.add_bridge_vlan(bridge_vlan)
 
     commands = net.get_commands()
+    keys = {cmd.key() for cmd in commands}
 
     # Check section type
     assert commands[0] == UCICommand("set", "network.br_trunk_vlan10", "bridge-vlan")
     # Check device
-    assert any(
-        cmd.path == "network.br_trunk_vlan10.device" and cmd.value == "br-trunk"
-        for cmd in commands
-    )
+    assert ("network.br_trunk_vlan10.device", "br-trunk") in keys
     # Check VLAN ID
-    assert any(
-        cmd.path == "network.br_trunk_vlan10.vlan" and cmd.value == "10" for cmd in commands
-    )
+    assert ("network.br_trunk_vlan10.vlan", "10") in keys
     # Check ports (should be list items)
     port_commands = [cmd for cmd in commands if cmd.path == "network.br_trunk_vlan10.ports"]
     assert len(port_commands) == 4
-    assert any(cmd.value == "lan1:u*" for cmd in port_commands)
-    assert any(cmd.value == "lan2:u*" for cmd in port_commands)
-    assert any(cmd.value == "lan3:u*" for cmd in port_commands)
-    assert any(cmd.value == "wds0:t" for cmd in port_commands)
+    port_values = {cmd.value for cmd in port_commands}
+    assert "lan1:u*" in port_values
+    assert "lan2:u*" in port_values
+    assert "lan3:u*" in port_values
+    assert "wds0:t" in port_values
+
+    # List options keep one command per item, in order
+    by_path = net.get_commands_by_path()
+    assert [cmd.value for cmd in by_path["network.br_trunk_vlan10.ports"]] == [
+        "lan1:u*",
+        "lan2:u*",
+        "lan3:u*",
+        "wds0:t",
+    ]
 
 
 def test_bridge_vlan_with_ports_method():
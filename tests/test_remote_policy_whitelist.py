@@ -4,6 +4,8 @@ import pytest
 from wrtkit import RemotePolicy, UCIConfig, NetworkInterface, NetworkDevice
 from wrtkit.dhcp import DHCPHost
 
+from .fixtures import StaticMockSSH
+
 
 def test_path_pattern_matching_exact():
     """Test exact path pattern matching."""
@@ -103,6 +105,68 @@ def test_whitelist_with_double_wildcard_middle():
     assert not policy.is_path_whitelisted("devices.br_lan.type")
 
 
+def test_compiled_whitelist_matches_segment_matcher():
+    """Test that the combined whitelist regex agrees with per-pattern matching."""
+    import itertools
+
+    patterns = [
+        "**",
+        "devices.**",
+        "devices.**.ports",
+        "**.ports",
+        "devices.*.*",
+        "hosts.guest_*.*",
+        "a.**.*",
+        "a.**.**",
+        "interfaces.gu*.*",
+        "devices.br_la?.ports",
+        "devices.br_[lw]an",
+    ]
+    paths = [
+        "",
+        "devices",
+        "devices.",
+        "devices.br_lan",
+        "devices.br_lan.ports",
+        "devices.nested.deep.ports",
+        "hosts.guest_1",
+        "hosts.guest_1.mac",
+        "hosts.guest_1.mac.x",
+        "a",
+        "a.",
+        "a.b.c",
+        "interfaces.gu*",
+        "interfaces.guest",
+        "ports",
+    ]
+
+    for pattern, path in itertools.product(patterns, paths):
+        policy = RemotePolicy(whitelist=[pattern])
+        expected = policy._match_path_pattern(path, pattern) or (
+            pattern.endswith(".*") and path == pattern[:-2]
+        )
+        assert policy.is_path_whitelisted(path) == expected, (pattern, path)
+
+    # Untranslatable globs ("?", "[...]") still work alongside compiled patterns
+    policy = RemotePolicy(whitelist=["interfaces.*.gateway", "devices.br_[lw]an"])
+    assert policy.is_path_whitelisted("interfaces.lan.gateway")
+    assert policy.is_path_whitelisted("devices.br_wan")
+    assert not policy.is_path_whitelisted("devices.br_xan")
+
+
+def test_whitelist_lookup_cache_follows_policy_edits():
+    """Test that memoized whitelist lookups never outlive a whitelist change."""
+    policy = RemotePolicy(whitelist=["interfaces.guest.*"])
+    assert policy.is_path_whitelisted("interfaces.guest.proto")
+    assert not policy.is_path_whitelisted("interfaces.lan.proto")
+
+    policy.whitelist.append("interfaces.lan.proto")
+    assert policy.is_path_whitelisted("interfaces.lan.proto")
+
+    policy.whitelist = ["interfaces.lan.*"]
+    assert not policy.is_path_whitelisted("interfaces.guest.proto")
+
+
 def test_should_keep_remote_path_with_whitelist():
     """Test should_keep_remote_path with whitelist configured."""
     policy = RemotePolicy(whitelist=["devices.*.lan", "interfaces.guest.*"])
@@ -138,18 +202,17 @@ def test_whitelist_empty_means_nothing_kept():
 def test_whitelist_in_diff_remote_only_section():
     """Test that diff respects whitelist for remote-only sections."""
 
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "network":
-                return """
+    class MockSSH(StaticMockSSH):
+        packages = {
+            "network": """
 network.guest=interface
 network.guest.proto='static'
 network.guest.ipaddr='192.168.100.1'
 network.guest.gateway='192.168.100.254'
 network.temp=interface
 network.temp.proto='dhcp'
-"""
-            return ""
+""",
+        }
 
     config = UCIConfig()
 
@@ -179,17 +242,16 @@ network.temp.proto='dhcp'
 def test_whitelist_in_diff_local_section_with_remote_extras():
     """Test whitelist with a locally-managed section that has extra remote options."""
 
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "dhcp":
-                return """
+    class MockSSH(StaticMockSSH):
+        packages = {
+            "dhcp": """
 dhcp.monoprice=host
 dhcp.monoprice.mac='AA:BB:CC:DD:EE:FF'
 dhcp.monoprice.ip='192.168.1.100'
 dhcp.monoprice.hostname='monoprice-speaker'
 dhcp.monoprice.force='1'
-"""
-            return ""
+""",
+        }
 
     config = UCIConfig()
 
@@ -219,16 +281,15 @@ dhcp.monoprice.force='1'
 def test_whitelist_with_wildcard_keeps_everything():
     """Test that ** whitelist keeps everything."""
 
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "network":
-                return """
+    class MockSSH(StaticMockSSH):
+        packages = {
+            "network": """
 network.guest=interface
 network.guest.proto='static'
 network.temp=interface
 network.temp.proto='dhcp'
-"""
-            return ""
+""",
+        }
 
     config = UCIConfig()
 
@@ -244,21 +305,33 @@ network.temp.proto='dhcp'
     assert len(diff.whitelisted) > 0
 
 
+def test_whitelist_double_wildcard_among_other_patterns():
+    """Test that a ** pattern keeps any path, whatever other patterns are listed."""
+    policy = RemotePolicy(whitelist=["devices.br_lan.ports"])
+    assert not policy.is_path_whitelisted("interfaces.lan.proto")
+
+    policy.whitelist.append("**")
+
+    assert policy.is_path_whitelisted("interfaces.lan.proto")
+    assert policy.is_path_whitelisted("interfaces")
+    assert policy.is_path_whitelisted("a.b.c.d.e.f")
+    assert policy.is_path_whitelisted("interfaces.wan6.ip6assign[0]")
+
+
 def test_whitelist_with_device_ports():
     """Test whitelist with device ports (list values)."""
 
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "network":
-                return """
+    class MockSSH(StaticMockSSH):
+        packages = {
+            "network": """
 network.br_lan=device
 network.br_lan.type='bridge'
 network.br_lan.ports='lan1'
 network.br_lan.ports='lan2'
 network.br_lan.ports='bat0'
 network.br_lan.ports='wlan0'
-"""
-            return ""
+""",
+        }
 
     config = UCIConfig()
 
@@ -283,10 +356,9 @@ network.br_lan.ports='wlan0'
 def test_whitelist_combined_patterns():
     """Test realistic combined whitelist patterns."""
 
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "network":
-                return """
+    class MockSSH(StaticMockSSH):
+        packages = {
+            "network": """
 network.lan=interface
 network.lan.proto='static'
 network.lan.ipaddr='192.168.1.1'
@@ -297,8 +369,8 @@ network.guest.ipaddr='192.168.100.1'
 network.guest.gateway='192.168.100.254'
 network.temp_test=interface
 network.temp_test.proto='dhcp'
-"""
-            return ""
+""",
+        }
 
     config = UCIConfig()
 
@@ -338,18 +410,17 @@ network.temp_test.proto='dhcp'
 def test_backward_compatibility_with_allowed_sections():
     """Test that old allowed_sections still works when whitelist is not set."""
 
-    class MockSSH:
-        def get_uci_config(self, package: str) -> str:
-            if package == "network":
-                return """
+    class MockSSH(StaticMockSSH):
+        packages = {
+            "network": """
 network.lan=interface
 network.lan.proto='static'
 network.guest=interface
 network.guest.proto='static'
 network.temp=interface
 network.temp.proto='dhcp'
-"""
-            return ""
+""",
+        }
 
     config = UCIConfig()
 
@@ -382,5 +453,22 @@ def test_whitelist_precedence_over_allowed_sections():
     assert not policy.should_keep_remote_path("interfaces.lan.gateway")
 
 
+def test_section_fully_whitelisted():
+    """Test detection of sections whose every option is whitelisted."""
+    policy = RemotePolicy(whitelist=["interfaces.guest.*", "interfaces.gu*.*"])
+
+    assert policy.section_fully_whitelisted("interfaces.guest")
+    assert not policy.section_fully_whitelisted("interfaces.lan")
+    # The section path must itself be whitelisted, not only its options
+    assert not RemotePolicy(whitelist=["interfaces.gu*.*"]).section_fully_whitelisted(
+        "interfaces.guest"
+    )
+    # A pattern naming a single option does not cover the whole section
+    assert not RemotePolicy(whitelist=["interfaces.guest.proto"]).section_fully_whitelisted(
+        "interfaces.guest"
+    )
+    assert RemotePolicy(whitelist=["**"]).section_fully_whitelisted("interfaces.lan")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
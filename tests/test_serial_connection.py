@@ -0,0 +1,80 @@
+"""Tests for the serial console connection."""
+
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+from wrtkit import SerialConnection
+from wrtkit.config import fetch_uci_configs
+
+
+class CannedSerialConnection(SerialConnection):
+    """SerialConnection whose execute() returns canned output instead of using a port."""
+
+    def __init__(self, outputs: Dict[str, Tuple[str, str, int]]):
+        super().__init__(timeout=2.0)
+        self.outputs = outputs
+        self.calls: List[Tuple[str, Optional[float]]] = []
+
+    def execute(self, command: str, timeout: Optional[float] = None) -> Tuple[str, str, int]:
+        self.calls.append((command, timeout))
+        for prefix, output in self.outputs.items():
+            if command.startswith(prefix):
+                return output
+        raise AssertionError(f"unexpected command: {command}")
+
+
+NETWORK_EXPORT = "package network\n\nconfig interface 'lan'\n\toption proto 'static'"
+DHCP_EXPORT = "package dhcp\n\nconfig dnsmasq\n\toption domain 'lan'"
+
+
+def test_get_uci_configs_splits_output_on_markers():
+    """Test that the combined export is split per package and failed packages are left out."""
+    stdout = "\n".join(
+        [
+            # Wrapped fragment of the echoed command, ignored before the first marker
+            'xport "$p" 2>/dev/null || echo "@@uci-failed $p"; done; echo "@@uci-done"',
+            "@@uci-export network",
+            NETWORK_EXPORT,
+            "@@uci-export sqm",
+            "@@uci-failed sqm",
+            "@@uci-export dhcp",
+            DHCP_EXPORT,
+            "@@uci-done",
+        ]
+    )
+    conn = CannedSerialConnection({"for p in": (stdout, "", 0)})
+
+    configs = conn.get_uci_configs(["network", "sqm", "dhcp"])
+
+    assert configs == {"network": NETWORK_EXPORT, "dhcp": DHCP_EXPORT}
+    # The packages share one read, so the wait scales with their number
+    assert conn.calls[0][1] == pytest.approx(6.0)
+
+
+def test_get_uci_configs_rejects_cut_off_output():
+    """Test that output missing the final marker is not returned as complete."""
+    stdout = "@@uci-export network\n" + NETWORK_EXPORT + "\n@@uci-export dhcp\npackage dh"
+    conn = CannedSerialConnection({"for p in": (stdout, "", 0)})
+
+    with pytest.raises(RuntimeError, match="cut off"):
+        conn.get_uci_configs(["network", "dhcp"])
+
+
+def test_fetch_uci_configs_falls_back_when_batch_is_cut_off():
+    """Test that a cut-off batch export is retried one package at a time."""
+    conn = CannedSerialConnection(
+        {
+            "for p in": ("@@uci-export network\npackage net", "", 0),
+            "uci export network": (NETWORK_EXPORT, "", 0),
+            "uci export dhcp": (DHCP_EXPORT, "", 0),
+        }
+    )
+
+    configs = fetch_uci_configs(conn, ["network", "dhcp"])
+
+    assert configs == {"network": NETWORK_EXPORT, "dhcp": DHCP_EXPORT}
+    assert [command for command, _ in conn.calls[1:]] == [
+        "uci export network",
+        "uci export dhcp",
+    ]
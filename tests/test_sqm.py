@@ -22,14 +22,15 @@ def test_sqm_basic_configuration():
     assert len(commands) == 7
 
     assert commands[0] == UCICommand("set", "sqm.wan", "queue")
-    assert any(cmd.path == "sqm.wan.interface" and cmd.value == "eth0" for cmd in commands)
-    assert any(cmd.path == "sqm.wan.download" and cmd.value == "50000" for cmd in commands)
-    assert any(cmd.path == "sqm.wan.upload" and cmd.value == "10000" for cmd in commands)
-    assert any(cmd.path == "sqm.wan.qdisc" and cmd.value == "cake" for cmd in commands)
-    assert any(
-        cmd.path == "sqm.wan.script" and cmd.value == "piece_of_cake.qos" for cmd in commands
-    )
-    assert any(cmd.path == "sqm.wan.enabled" and cmd.value == "1" for cmd in commands)
+
+    by_path = sqm.get_commands_by_path()
+    assert len(by_path) == 7
+    assert by_path["sqm.wan.interface"] == [UCICommand("set", "sqm.wan.interface", "eth0")]
+    assert by_path["sqm.wan.download"][0].value == "50000"
+    assert by_path["sqm.wan.upload"][0].value == "10000"
+    assert by_path["sqm.wan.qdisc"][0].value == "cake"
+    assert by_path["sqm.wan.script"][0].value == "piece_of_cake.qos"
+    assert by_path["sqm.wan.enabled"][0].value == "1"
 
 
 def test_sqm_disabled():